@@ -0,0 +1,182 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Mapping
+
+import httpx
+
+from api.cache import cache_key
+from api.client import ApiClient, has_next_page, regions_params
+from api.instrumentation import ConnectionStats
+from api.scheduler import Scheduler
+from api.single_flight import AsyncSingleFlight
+from api.transport import TransportConfig
+
+if TYPE_CHECKING:
+    from api.responses import RegionsItem, RegionsResponse
+
+
+class AsyncApiClient:
+    GET_REGIONS = ApiClient.GET_REGIONS
+
+    parse_regions = staticmethod(ApiClient.parse_regions)
+    parse_regions_error = staticmethod(ApiClient.parse_regions_error)
+    parse_compact_regions = staticmethod(ApiClient.parse_compact_regions)
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        max_connections: int = 10,
+        host: str | None = None,
+        coalesce: bool = False,
+        scheduler: Scheduler | None = None,
+        transport: TransportConfig | None = None,
+    ):
+        """
+        :param client: Preconfigured httpx.AsyncClient, one with the transport config is created if omitted
+        :param max_connections: Limit of concurrent requests and size of the connection pool, pool_size of transport
+            is used instead if it is given
+        :param host: Base URL of the API, settings.host if omitted
+        :param coalesce: Share one in-flight request between concurrent calls with the same query params
+        :param scheduler: Rate limiting and retries of requests, every request is sent once if omitted
+        :param transport: Pooling, keep-alive, compression and HTTP version of the created client
+        """
+
+        if transport is not None:
+            max_connections = transport.pool_size
+
+        self.connections = ConnectionStats()
+        if client is None:
+            client = (transport or TransportConfig(pool_size=max_connections)).async_client(self.connections)
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._host = host
+        self._single_flight = AsyncSingleFlight() if coalesce else None
+        self._scheduler = scheduler
+
+    @property
+    def host(self) -> str:
+        if self._host is None:
+            from settings import get_settings
+
+            self._host = get_settings().host
+
+        return self._host
+
+    @property
+    def coalesced(self) -> int:
+        """
+        Number of calls that got the response of a concurrent identical call
+        """
+
+        return self._single_flight.coalesced if self._single_flight else 0
+
+    async def __aenter__(self) -> 'AsyncApiClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def get_regions(
+        self,
+        q: str | Any = None,
+        country_code: str | Any = None,
+        page: int | Any = None,
+        page_size: int | Any = None,
+    ) -> httpx.Response:
+        """
+        :param q: Arbitrary string for fuzzy search by region name
+        :param country_code: Country code for filtering
+        :param page: Sequential number of page
+        :param page_size: Number of items per page
+        :return: httpx.Response
+        """
+
+        params = regions_params(q, country_code, page, page_size)
+        if self._single_flight is None:
+            return await self._send(params)
+
+        return await self._single_flight.do(cache_key(self.host + self.GET_REGIONS, params), lambda: self._send(params))
+
+    async def gather_regions(self, params: Iterable[Mapping[str, Any]]) -> list[httpx.Response]:
+        """
+        Concurrently get regions for every set of query params
+
+        :param params: get_regions keyword arguments per request
+        :return: Responses in the order of params
+        """
+
+        return await asyncio.gather(*(self.get_regions(**kwargs) for kwargs in params))
+
+    async def iter_pages(
+        self,
+        q: str | Any = None,
+        country_code: str | Any = None,
+        page_size: int | None = None,
+    ) -> AsyncIterator['RegionsResponse']:
+        """
+        Walk pages of regions starting from the first one until total is exhausted.
+        The next page is requested while the current one is processed.
+
+        :param q: Arbitrary string for fuzzy search by region name
+        :param country_code: Country code for filtering
+        :param page_size: Number of items per page
+        :return: Async iterator of validated pages
+        :raises httpx.HTTPStatusError: If any page is not fetched successfully
+        """
+
+        page = 1
+        expected_page_size = page_size
+        next_regions = asyncio.create_task(self._get_regions_page(q, country_code, page, page_size))
+        try:
+            while next_regions is not None:
+                regions = await next_regions
+                next_regions = None
+                expected_page_size = expected_page_size or len(regions.items)
+                if has_next_page(regions, page, expected_page_size):
+                    page += 1
+                    next_regions = asyncio.create_task(self._get_regions_page(q, country_code, page, page_size))
+                yield regions
+        finally:
+            if next_regions is not None:
+                next_regions.cancel()
+
+    async def iter_regions(
+        self,
+        q: str | Any = None,
+        country_code: str | Any = None,
+        page_size: int | None = None,
+    ) -> AsyncIterator['RegionsItem']:
+        """
+        Same as iter_pages, but yields items of the pages
+
+        :return: Async iterator of validated items
+        """
+
+        async for regions in self.iter_pages(q, country_code, page_size):
+            for item in regions.items:
+                yield item
+
+    async def _send(self, params: dict[str, Any]) -> httpx.Response:
+        url = self.host + self.GET_REGIONS
+
+        async def send() -> httpx.Response:
+            async with self._semaphore:
+                return await self._client.get(url, params=params)
+
+        if self._scheduler is None:
+            return await send()
+
+        return await self._scheduler.acall(url, send)
+
+    async def _get_regions_page(
+        self,
+        q: Any,
+        country_code: Any,
+        page: int,
+        page_size: int | None,
+    ) -> 'RegionsResponse':
+        response = await self.get_regions(q=q, country_code=country_code, page=page, page_size=page_size)
+        response.raise_for_status()
+        return self.parse_regions(response)
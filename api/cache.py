@@ -0,0 +1,158 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Hashable, Mapping
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+def cache_key(url: str, params: Mapping[str, Any]) -> Hashable:
+    """
+    Normalize URL and query params to a cache key: omitted (None) values are dropped and values are stringified,
+    the same way they are sent in the query string, so clients of different hosts sharing a cache don't mix responses
+
+    :param url: URL of the request without query string
+    :param params: Query params of the request
+    """
+
+    return url, tuple(sorted((key, str(value)) for key, value in params.items() if value is not None))
+
+
+def is_cacheable(response: requests.Response) -> bool:
+    status = response.status_code
+    return status < HTTPStatus.INTERNAL_SERVER_ERROR and status != HTTPStatus.TOO_MANY_REQUESTS
+
+
+class ResponseCache:
+    def __init__(self, max_size: int = 1024, ttl: float | None = None):
+        """
+        :param max_size: Number of responses kept, least recently used ones are evicted first
+        :param ttl: Seconds a response is kept for, forever if omitted
+        """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._responses: OrderedDict[Hashable, tuple[float, requests.Response]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get(self, key: Hashable) -> requests.Response | None:
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is None or self._is_expired(entry[0]):
+                self._responses.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._responses.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, response: requests.Response) -> None:
+        if not is_cacheable(response):
+            return
+
+        with self._lock:
+            self._responses[key] = time.monotonic(), response
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_size:
+                self._responses.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+
+class SharedResponseCache:
+    def __init__(self, path: str | Path, max_size: int = 1024, ttl: float | None = None):
+        """
+        Same as ResponseCache, but kept in a SQLite file, so processes using the same file share responses
+
+        :param path: Database file, created if missing
+        :param max_size: Number of responses kept, least recently used ones are evicted first
+        :param ttl: Seconds a response is kept for, forever if omitted
+        """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, stored_at REAL, used_at REAL, status INTEGER, url TEXT, headers TEXT, content BLOB)'
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def get(self, key: Hashable) -> requests.Response | None:
+        db_key = json.dumps(key)
+        with self._lock:
+            row = self._db.execute(
+                'SELECT stored_at, status, url, headers, content FROM responses WHERE key = ?', (db_key,)
+            ).fetchone()
+            if row is None or self._is_expired(row[0]):
+                self.misses += 1
+                return None
+
+            self._db.execute('UPDATE responses SET used_at = ? WHERE key = ?', (time.time(), db_key))
+            self.hits += 1
+
+        _, status, url, headers, content = row
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        return response
+
+    def put(self, key: Hashable, response: requests.Response) -> None:
+        if not is_cacheable(response):
+            return
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    json.dumps(key),
+                    now,
+                    now,
+                    response.status_code,
+                    response.url,
+                    json.dumps(dict(response.headers)),
+                    response.content,
+                ),
+            )
+            self._db.execute(
+                'DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)',
+                (self.max_size,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
@@ -0,0 +1,193 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from api.cache import is_cacheable
+
+MODES = 'record', 'replay', 'refresh'
+
+# Base URL of clients that only replay, recordings are keyed without the host
+REPLAY_HOST = 'http://cassette.invalid'
+
+_MAGIC = b'RGCASS01'
+_FOOTER = struct.Struct('<QQ8s')
+
+
+class CassetteMiss(requests.RequestException):
+    """
+    No response is recorded for the request in replay mode. Not a connection error, so it is never retried
+    """
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """
+    Method, path and sorted query of the request, so cassettes don't depend on the host and the order of params
+    """
+
+    url = urlsplit(request.url)
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+    return f'{request.method} {url.path}?{query}'
+
+
+class Cassette:
+    def __init__(self, path: str | Path):
+        """
+        Recorded responses in a single file: zlib-compressed bodies followed by a compressed JSON index
+        of their offsets, statuses and headers, and a fixed-size footer locating the index.
+        An existing file is memory-mapped, bodies are decompressed only when replayed.
+
+        :param path: Cassette file, created on save if missing
+        """
+
+        self.path = Path(path)
+        self._index: dict[str, dict[str, Any]] = {}
+        self._new: dict[str, tuple[dict[str, Any], bytes]] = {}
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, 'rb') as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            footer_offset = len(self._map) - _FOOTER.size
+            index_offset, index_length, magic = _FOOTER.unpack(self._map[footer_offset:])
+            if magic != _MAGIC:
+                raise ValueError(f'{self.path} is not a cassette')
+            self._index = json.loads(zlib.decompress(self._read(index_offset, index_length)))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._new or key in self._index
+
+    def get(self, key: str) -> tuple[dict[str, Any], bytes] | None:
+        """
+        :return: Status, url and headers of the response and its body
+        """
+
+        with self._lock:
+            if key in self._new:
+                meta, compressed = self._new[key]
+            elif key in self._index:
+                meta = self._index[key]
+                compressed = self._read(meta['offset'], meta['length'])
+            else:
+                return None
+
+        return meta, zlib.decompress(compressed)
+
+    def put(self, key: str, response: requests.Response) -> None:
+        meta = {'status': response.status_code, 'reason': response.reason, 'headers': dict(response.headers)}
+        with self._lock:
+            self._new[key] = meta, zlib.compress(response.content)
+
+    def save(self) -> None:
+        """
+        Write recorded and previously stored responses to the file, if anything was recorded
+        """
+
+        with self._lock:
+            if not self._new:
+                return
+
+            index = {}
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'wb') as file:
+                for key, meta in self._index.items():
+                    if key not in self._new:
+                        index[key] = self._write(file, meta, self._read(meta['offset'], meta['length']))
+                for key, (meta, compressed) in self._new.items():
+                    index[key] = self._write(file, meta, compressed)
+
+                index_offset = file.tell()
+                compressed_index = zlib.compress(json.dumps(index, ensure_ascii=False).encode())
+                file.write(compressed_index)
+                file.write(_FOOTER.pack(index_offset, len(compressed_index), _MAGIC))
+
+            self.close()
+            os.replace(tmp_path, self.path)
+            self._index = index
+            self._new = {}
+            with open(self.path, 'rb') as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _read(self, offset: int, length: int) -> bytes:
+        end = offset + length
+        return self._map[offset:end]
+
+    @staticmethod
+    def _write(file, meta: dict[str, Any], compressed: bytes) -> dict[str, Any]:
+        offset = file.tell()
+        file.write(compressed)
+        return {**meta, 'offset': offset, 'length': len(compressed)}
+
+
+class CassetteAdapter(BaseAdapter):
+    def __init__(self, cassette: Cassette, mode: str = 'record', adapter: BaseAdapter | None = None):
+        """
+        Transport adapter replaying responses from a cassette
+
+        :param cassette: Cassette to replay from and record to
+        :param mode: record - replay recorded responses and record missing ones,
+            replay - only replay recorded responses, missing ones raise CassetteMiss,
+            refresh - send every request and record its response over the recorded one.
+            Streamed responses are replayed, but never recorded, nor are 429 and 5xx responses
+        :param adapter: Adapter sending requests to the network, HTTPAdapter if omitted
+        """
+
+        if mode not in MODES:
+            raise ValueError(f'Cassette mode must be one of {", ".join(MODES)}, got {mode!r}')
+
+        super().__init__()
+        self.cassette = cassette
+        self.mode = mode
+        self._adapter = adapter or HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = request_key(request)
+        if self.mode != 'refresh':
+            recorded = self.cassette.get(key)
+            if recorded is not None:
+                return self._build_response(request, *recorded)
+            if self.mode == 'replay':
+                raise CassetteMiss(f'No recorded response for {key} in {self.cassette.path}', request=request)
+
+        response = self._adapter.send(request, **kwargs)
+        # Body of a streamed response is read by its consumer under its size limit, it isn't read whole to be recorded.
+        # 429 and 5xx are not recorded, so retries reach the server and later runs don't replay the failure
+        if not kwargs.get('stream') and is_cacheable(response):
+            self.cassette.put(key, response)
+        return response
+
+    def close(self) -> None:
+        self._adapter.close()
+        self.cassette.save()
+        self.cassette.close()
+
+    def _build_response(
+        self, request: requests.PreparedRequest, meta: dict[str, Any], body: bytes
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.reason = meta['reason']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = body
+        response._content_consumed = True
+        return response
@@ -1,15 +1,96 @@
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Hashable, Iterator, Mapping
 
 import requests
 
-from settings import settings
+from api.cache import ResponseCache, SharedResponseCache, cache_key
+from api.instrumentation import timed_decode
+from api.scheduler import Scheduler
+from api.single_flight import SingleFlight
+from api.streaming import iter_items
+
+if TYPE_CHECKING:
+    from api.responses import CompactRegionsResponse, RegionsError, RegionsItem, RegionsResponse
+
+
+def regions_params(
+    q: str | Any = None,
+    country_code: str | Any = None,
+    page: int | Any = None,
+    page_size: int | Any = None,
+) -> dict[str, Any]:
+    """
+    Query params of GET /1.0/regions without omitted (None) values
+    """
+
+    params = {
+        'q': q,
+        'country_code': country_code,
+        'page': page,
+        'page_size': page_size,
+    }
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def has_next_page(regions: 'RegionsResponse', page: int, page_size: int | None = None) -> bool:
+    """
+    :param regions: Validated page of regions
+    :param page: Sequential number of the page
+    :param page_size: Expected number of items per page, length of the page if omitted
+    :return: Whether a page after this one can contain items
+    """
+
+    if not regions.items:
+        return False
+    if page_size is not None and len(regions.items) < page_size:
+        return False
+    return page * (page_size or len(regions.items)) < regions.total
 
 
 class ApiClient:
     GET_REGIONS = '/1.0/regions'
 
-    def __init__(self, session: requests.Session):
+    def __init__(
+        self,
+        session: requests.Session,
+        cache: ResponseCache | SharedResponseCache | None = None,
+        host: str | None = None,
+        coalesce: bool = False,
+        scheduler: Scheduler | None = None,
+        max_body_size: int | None = None,
+    ):
+        """
+        :param session: Session requests are sent with
+        :param cache: Cache of responses by query params, responses are not cached if omitted
+        :param host: Base URL of the API, settings.host if omitted
+        :param coalesce: Share one in-flight request between concurrent calls with the same query params
+        :param scheduler: Rate limiting and retries of requests, every request is sent once if omitted
+        :param max_body_size: Maximal number of body bytes of streamed pages, unlimited if omitted
+        """
+
         self._session = session
+        self._cache = cache
+        self._host = host
+        self._single_flight = SingleFlight() if coalesce else None
+        self._scheduler = scheduler
+        self._max_body_size = max_body_size
+
+    @property
+    def host(self) -> str:
+        if self._host is None:
+            from settings import get_settings
+
+            self._host = get_settings().host
+
+        return self._host
+
+    @property
+    def coalesced(self) -> int:
+        """
+        Number of calls that got the response of a concurrent identical call
+        """
+
+        return self._single_flight.coalesced if self._single_flight else 0
 
     def get_regions(
         self,
@@ -17,21 +98,166 @@ class ApiClient:
         country_code: str | Any = None,
         page: int | Any = None,
         page_size: int | Any = None,
+        bypass_cache: bool = False,
+        headers: Mapping[str, str] | None = None,
     ) -> requests.Response:
         """
         :param q: Arbitrary string for fuzzy search by region name
         :param country_code: Country code for filtering
         :param page: Sequential number of page
         :param page_size: Number of items per page
+        :param bypass_cache: Send the request even if the response is cached
+        :param headers: Additional request headers, such requests are never cached nor coalesced
         :return: requests.Response
         """
 
-        return self._session.get(
-            settings.host + self.GET_REGIONS,
-            params={
-                'q': q,
-                'country_code': country_code,
-                'page': page,
-                'page_size': page_size,
-            },
-        )
+        params = regions_params(q, country_code, page, page_size)
+        if headers:
+            return self._send(None, params, headers=headers)
+
+        key = cache_key(self.host + self.GET_REGIONS, params)
+        if self._cache is not None and not bypass_cache:
+            response = self._cache.get(key)
+            if response is not None:
+                return response
+
+        response = self._send(key, params)
+        if self._cache is not None:
+            self._cache.put(key, response)
+
+        return response
+
+    @staticmethod
+    def parse_regions(response: requests.Response) -> 'RegionsResponse':
+        """
+        Validate raw body of the response as a page of regions without intermediate dict.
+        The page is kept on the response, so callers sharing the response decode it once.
+        """
+
+        from api import responses
+
+        regions = getattr(response, 'regions', None)
+        if regions is None:
+            with timed_decode(response):
+                regions = response.regions = responses.parse_regions(response.content)
+
+        return regions
+
+    @staticmethod
+    def parse_regions_error(response: requests.Response) -> 'RegionsError':
+        """
+        Validate raw body of the response as an error without intermediate dict
+        """
+
+        from api import responses
+
+        with timed_decode(response):
+            return responses.parse_regions_error(response.content)
+
+    @staticmethod
+    def parse_compact_regions(response: requests.Response) -> 'CompactRegionsResponse':
+        """
+        Validate raw body of the response as a page of frozen slotted items with shared country instances
+        """
+
+        from api import responses
+
+        with timed_decode(response):
+            return responses.parse_compact_regions(response.content)
+
+    def stream_regions(
+        self,
+        q: str | Any = None,
+        country_code: str | Any = None,
+        page: int | Any = None,
+        page_size: int | Any = None,
+    ) -> Iterator['RegionsItem']:
+        """
+        Items of a page validated one by one as the body arrives, the body is never held in memory whole.
+        Streamed responses are neither cached nor coalesced, and their body is not logged.
+
+        :param q: Arbitrary string for fuzzy search by region name
+        :param country_code: Country code for filtering
+        :param page: Sequential number of page
+        :param page_size: Number of items per page
+        :return: Iterator of validated items
+        :raises requests.HTTPError: If the page is not fetched successfully
+        :raises ResponseTooLarge: If the body exceeds max_body_size
+        """
+
+        from api.responses import RegionsItem
+
+        response = self._send(None, regions_params(q, country_code, page, page_size), stream=True)
+        with response:
+            response.raise_for_status()
+            for item in iter_items(response, self._max_body_size):
+                yield RegionsItem.model_validate(item)
+
+    def iter_pages(
+        self,
+        q: str | Any = None,
+        country_code: str | Any = None,
+        page_size: int | None = None,
+    ) -> Iterator['RegionsResponse']:
+        """
+        Walk pages of regions starting from the first one until total is exhausted.
+        The next page is requested in background while the current one is processed.
+
+        :param q: Arbitrary string for fuzzy search by region name
+        :param country_code: Country code for filtering
+        :param page_size: Number of items per page
+        :return: Iterator of validated pages
+        :raises requests.HTTPError: If any page is not fetched successfully
+        """
+
+        page = 1
+        expected_page_size = page_size
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_regions = executor.submit(self._get_regions_page, q, country_code, page, page_size)
+            while next_regions is not None:
+                regions = next_regions.result()
+                next_regions = None
+                expected_page_size = expected_page_size or len(regions.items)
+                if has_next_page(regions, page, expected_page_size):
+                    page += 1
+                    next_regions = executor.submit(self._get_regions_page, q, country_code, page, page_size)
+                yield regions
+
+    def iter_regions(
+        self,
+        q: str | Any = None,
+        country_code: str | Any = None,
+        page_size: int | None = None,
+    ) -> Iterator['RegionsItem']:
+        """
+        Same as iter_pages, but yields items of the pages
+
+        :return: Iterator of validated items
+        """
+
+        for regions in self.iter_pages(q, country_code, page_size):
+            yield from regions.items
+
+    def _send(self, key: Hashable | None, params: dict[str, Any], **kwargs) -> requests.Response:
+        """
+        :param key: Key of coalesced requests, the request is never coalesced if None
+        :param kwargs: Arguments of requests.Session.get
+        """
+
+        url = self.host + self.GET_REGIONS
+
+        def send() -> requests.Response:
+            if self._scheduler is None:
+                return self._session.get(url, params=params, **kwargs)
+
+            return self._scheduler.call(url, lambda: self._session.get(url, params=params, **kwargs))
+
+        if self._single_flight is None or key is None:
+            return send()
+
+        return self._single_flight.do(key, send)
+
+    def _get_regions_page(self, q: Any, country_code: Any, page: int, page_size: int | None) -> 'RegionsResponse':
+        response = self.get_regions(q=q, country_code=country_code, page=page, page_size=page_size)
+        response.raise_for_status()
+        return self.parse_regions(response)
@@ -0,0 +1,83 @@
+from functools import cached_property
+from typing import Iterable, Protocol, Sequence
+
+import numpy as np
+
+
+class _Country(Protocol):
+    code: str
+
+
+class _Item(Protocol):
+    id: int
+    name: str
+    code: str
+    country: _Country
+
+
+class _Page(Protocol):
+    items: Sequence[_Item]
+
+
+class RegionsColumns:
+    def __init__(self, items: Iterable[_Item]):
+        """
+        Columnar view of regions items: ids, names, codes and country codes held as arrays,
+        so checks of all items are done by vectorized operations instead of loops over items
+
+        :param items: Items of full or compact regions responses
+        """
+
+        ids, names, codes, country_codes = [], [], [], []
+        for item in items:
+            ids.append(item.id)
+            names.append(item.name)
+            codes.append(item.code)
+            country_codes.append(item.country.code)
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.names = np.array(names, dtype=np.str_)
+        self.codes = np.array(codes, dtype=np.str_)
+        self.country_codes = np.array(country_codes, dtype=np.str_)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[_Page]) -> 'RegionsColumns':
+        return cls(item for page in pages for item in page.items)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @cached_property
+    def lower_names(self) -> np.ndarray:
+        return np.char.lower(self.names)
+
+    def names_not_containing(self, q: str) -> list[str]:
+        """
+        :return: Violations of items whose name doesn't contain q case-insensitively
+        """
+
+        offending = np.char.find(self.lower_names, q.lower()) < 0
+        return self.violations(offending, f'name doesn\'t contain {q!r}')
+
+    def country_codes_other_than(self, country_code: str) -> list[str]:
+        """
+        :return: Violations of items of other countries than country_code
+        """
+
+        offending = self.country_codes != country_code
+        return self.violations(offending, f'country code is not {country_code!r}')
+
+    def violations(self, offending: np.ndarray, message: str) -> list[str]:
+        """
+        :param offending: Boolean mask of offending items
+        :param message: What is wrong with the offending items
+        :return: One violation per offending item
+        """
+
+        rows = np.flatnonzero(offending)
+        return [
+            f'Item {item_id} {name!r} of {country_code!r}: {message}'
+            for item_id, name, country_code in zip(
+                self.ids[rows].tolist(), self.names[rows].tolist(), self.country_codes[rows].tolist()
+            )
+        ]
@@ -0,0 +1,302 @@
+import itertools
+import logging
+import random
+import socket
+import statistics
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = 'dns', 'connect', 'tls', 'ttfb', 'total', 'decode'
+
+_local = threading.local()
+
+
+@dataclass
+class RequestTiming:
+    method: str
+    endpoint: str
+    status: int
+    size: int
+    ttfb: float
+    total: float
+    dns: float | None = None
+    connect: float | None = None
+    tls: float | None = None
+    decode: float | None = None
+    new_connection: bool = False
+    wire_size: int = 0
+    test: str | None = None
+
+
+@dataclass
+class _ConnectionEvents:
+    dns: float | None = None
+    connect: float | None = None
+    tls: float | None = None
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """
+    :param values: Durations in seconds
+    :return: p50, p95 and p99 of the durations in milliseconds
+    """
+
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    if len(values) == 1:
+        return {'p50': values[0] * 1e3, 'p95': values[0] * 1e3, 'p99': values[0] * 1e3}
+
+    cut_points = statistics.quantiles(values, n=100, method='inclusive')
+    return {'p50': cut_points[49] * 1e3, 'p95': cut_points[94] * 1e3, 'p99': cut_points[98] * 1e3}
+
+
+class _TimedConnectionMixin:
+    _dns_host: str
+    port: int
+
+    def _new_conn(self) -> socket.socket:
+        events = getattr(_local, 'events', None)
+        if events is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            hosts = list(dict.fromkeys(address[4][0] for address in addresses))
+        except socket.gaierror:
+            hosts = [host]
+        resolved = time.perf_counter()
+
+        try:
+            for index, self._dns_host in enumerate(hosts, start=1):
+                try:
+                    sock = super()._new_conn()
+                    break
+                except ConnectTimeoutError:
+                    if index == len(hosts):
+                        raise
+        finally:
+            self._dns_host = host
+
+        events.dns = resolved - started
+        events.connect = time.perf_counter() - resolved
+        return sock
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        events = getattr(_local, 'events', None)
+        started = time.perf_counter()
+        super().connect()
+        if events is not None and events.dns is not None:
+            events.tls = max(0.0, time.perf_counter() - started - events.dns - events.connect)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class ConnectionStats:
+    def __init__(self):
+        """
+        Counters of requests sent over new and reused connections and of body bytes received over the wire,
+        before content decoding
+        """
+
+        self.new = 0
+        self.reused = 0
+        self.wire_bytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, new_connection: bool, wire_size: int = 0) -> None:
+        with self._lock:
+            if new_connection:
+                self.new += 1
+            else:
+                self.reused += 1
+            self.wire_bytes += wire_size
+
+    def received(self, size: int) -> None:
+        with self._lock:
+            self.wire_bytes += size
+
+    def summary(self) -> dict[str, Any]:
+        requests_count = self.new + self.reused
+        return {
+            'new': self.new,
+            'reused': self.reused,
+            'reuse_rate': round(self.reused / requests_count, 4) if requests_count else 0.0,
+            'wire_bytes': self.wire_bytes,
+        }
+
+
+class RequestMetrics:
+    def __init__(self, keep_timings: bool = True):
+        """
+        Timings of all requests of the session, tagged with the test that is running
+
+        :param keep_timings: Keep timing of every request, only connection counters are updated otherwise
+        """
+
+        self.current_test: str | None = None
+        self.connections = ConnectionStats()
+        self._keep_timings = keep_timings
+        self._by_test: dict[str | None, list[RequestTiming]] = defaultdict(list)
+
+    @property
+    def timings(self) -> list[RequestTiming]:
+        return list(itertools.chain.from_iterable(self._by_test.values()))
+
+    def record(self, timing: RequestTiming) -> None:
+        self.connections.record(timing.new_connection, timing.wire_size)
+        if self._keep_timings:
+            timing.test = self.current_test
+            self._by_test[timing.test].append(timing)
+
+    def for_test(self, test: str) -> list[RequestTiming]:
+        return list(self._by_test.get(test, ()))
+
+    @staticmethod
+    def summary(timings: Iterable[RequestTiming]) -> dict[str, dict[str, Any]]:
+        """
+        :return: Number of requests, new connections, bytes, bytes over the wire and percentiles of every phase
+            per endpoint
+        """
+
+        by_endpoint: dict[str, list[RequestTiming]] = defaultdict(list)
+        for timing in timings:
+            by_endpoint[timing.endpoint].append(timing)
+
+        summary = {}
+        for endpoint, endpoint_timings in sorted(by_endpoint.items()):
+            phases = {}
+            for phase in PHASES:
+                values = [getattr(timing, phase) for timing in endpoint_timings]
+                values = [value for value in values if value is not None]
+                if values:
+                    phases[phase] = {'count': len(values), **percentiles(values)}
+
+            summary[endpoint] = {
+                'requests': len(endpoint_timings),
+                'new_connections': sum(timing.new_connection for timing in endpoint_timings),
+                'bytes': sum(timing.size for timing in endpoint_timings),
+                'wire_bytes': sum(timing.wire_size for timing in endpoint_timings),
+                'phases_ms': phases,
+            }
+
+        return summary
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    def __init__(self, metrics: RequestMetrics, **kwargs):
+        """
+        Transport adapter recording DNS, connect, TLS, time to first byte, total time, size, size over the wire
+        and whether a new connection was opened for every request
+
+        :param metrics: Recorder of timings
+        """
+
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        events = _local.events = _ConnectionEvents()
+        started = time.perf_counter()
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+        finally:
+            _local.events = None
+        ttfb = time.perf_counter() - started
+        size = 0 if stream else len(response.content)
+        # Bytes read from the socket before content decoding, the body of a streamed response is not read yet
+        wire_size = 0 if stream or response.raw is None else response.raw.tell()
+
+        timing = RequestTiming(
+            method=request.method,
+            endpoint=urlsplit(request.url).path,
+            status=response.status_code,
+            size=size,
+            ttfb=ttfb,
+            total=time.perf_counter() - started,
+            dns=events.dns,
+            connect=events.connect,
+            tls=events.tls,
+            new_connection=events.connect is not None,
+            wire_size=wire_size,
+        )
+        response.timing = timing
+        self.metrics.record(timing)
+
+        return response
+
+
+@contextmanager
+def timed_decode(response: Any) -> Iterator[None]:
+    """
+    Add time spent in the block to decode time of the response, if the response is instrumented
+    """
+
+    started = time.perf_counter()
+    yield
+    timing: RequestTiming | None = getattr(response, 'timing', None)
+    if timing is not None:
+        timing.decode = (timing.decode or 0.0) + time.perf_counter() - started
+
+
+class ResponseLogger:
+    def __init__(self, logger: logging.Logger, body_limit: int = 1000, sample_rate: float = 1.0):
+        """
+        Session response hook logging request line, status, timing and a truncated body
+
+        :param logger: Logger to write to
+        :param body_limit: Maximal number of logged body bytes
+        :param sample_rate: Share of successful responses with logged body, bodies of errors are always logged
+        """
+
+        self._logger = logger
+        self._body_limit = body_limit
+        self._sample_rate = sample_rate
+
+    def __call__(self, r: requests.Response, *args, **kwargs) -> requests.Response:
+        timing: RequestTiming | None = getattr(r, 'timing', None)
+        elapsed = f' in {timing.total * 1e3:.1f} ms, {timing.size} bytes' if timing else ''
+        self._logger.info(f'Request: {r.request.method} {r.request.url}')
+        self._logger.info(f'Response: {r.status_code}{elapsed}')
+
+        # Body of a streamed response is read by its consumer and isn't held to be logged
+        if kwargs.get('stream') or r.ok and random.random() >= self._sample_rate:
+            return r
+
+        limit = self._body_limit
+        body = r.content[:limit].decode(r.encoding or 'utf-8', errors='replace')
+        truncated = '...' if len(r.content) > limit else ''
+        self._logger.info(f'Body: {body}{truncated}')
+        return r
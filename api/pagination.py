@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from typing import Iterable, Protocol, Sequence
+
+
+class _Item(Protocol):
+    id: int
+
+
+class _Page(Protocol):
+    total: int
+    items: Sequence[_Item]
+
+
+@dataclass
+class PaginationReport:
+    pages: int = 0
+    items: int = 0
+    violations: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+
+class PaginationInvariants:
+    def __init__(
+        self,
+        page_size: int,
+        total: int | None = None,
+        order: Sequence[int] | None = None,
+    ):
+        """
+        Check pages of a single walk one by one against an index of seen item ids
+
+        :param page_size: Requested number of items per page
+        :param total: Expected number of items on all pages, not checked if omitted
+        :param order: Expected ids of items on all pages in order, not checked if omitted
+        """
+
+        self._page_size = page_size
+        self._total = total
+        self._order = order
+        self._index: dict[int, int] = {}
+        self._last_page: int | None = None
+        self._reported_total: int | None = None
+        self.report = PaginationReport()
+
+    def add_page(self, page: _Page) -> None:
+        self.report.pages += 1
+        page_number = self.report.pages
+
+        if self._reported_total is None:
+            self._reported_total = page.total
+        elif page.total != self._reported_total:
+            self._violate(f'Page {page_number}: total {page.total} differs from {self._reported_total}')
+
+        if self._last_page is not None and page.items:
+            self._violate(f'Page {page_number}: {len(page.items)} items after the last page {self._last_page}')
+        if len(page.items) > self._page_size:
+            self._violate(f'Page {page_number}: {len(page.items)} items exceed page size {self._page_size}')
+        if len(page.items) < self._page_size and self._last_page is None:
+            self._last_page = page_number
+
+        for item in page.items:
+            self._add_item(page_number, item)
+
+    def check(self) -> PaginationReport:
+        """
+        :return: Report with violations of all added pages and coverage of expected total and order
+        """
+
+        if self._total is not None and len(self._index) != self._total:
+            self._violate(f'{len(self._index)} unique items on all pages, expected {self._total}')
+        if self._order is not None and self.report.items < len(self._order):
+            self._violate(f'{self.report.items} items on all pages, expected {len(self._order)} in order')
+
+        return self.report
+
+    def _add_item(self, page_number: int, item: _Item) -> None:
+        position = self.report.items
+        self.report.items += 1
+
+        first_page_number = self._index.get(item.id)
+        if first_page_number is None:
+            self._index[item.id] = page_number
+        else:
+            self._violate(f'Page {page_number}: item {item.id} is duplicated, first seen on page {first_page_number}')
+
+        expected_id = self._order[position] if self._order is not None and position < len(self._order) else None
+        if expected_id is not None and expected_id != item.id:
+            self._violate(f'Page {page_number}: item {item.id} at position {position}, expected {expected_id}')
+
+    def _violate(self, message: str) -> None:
+        self.report.violations.append(message)
+
+
+def check_pages(
+    pages: Iterable[_Page],
+    page_size: int,
+    total: int | None = None,
+    order: Sequence[int] | None = None,
+) -> PaginationReport:
+    """
+    Check uniqueness of items, coverage of total, order of items and empty trailing pages in a single pass
+
+    :param pages: Pages of a single walk starting from the first one
+    :param page_size: Requested number of items per page
+    :param total: Expected number of items on all pages, not checked if omitted
+    :param order: Expected ids of items on all pages in order, not checked if omitted
+    :return: Report with all found violations
+    """
+
+    invariants = PaginationInvariants(page_size, total, order)
+    for page in pages:
+        invariants.add_page(page)
+
+    return invariants.check()
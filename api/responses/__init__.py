@@ -1,2 +1,10 @@
+from .adapters import REGIONS_RESULT_ADAPTER, parse_regions, parse_regions_error, parse_regions_result
+from .compact import (
+    COMPACT_REGIONS_ADAPTER,
+    CompactRegionsCountry,
+    CompactRegionsItem,
+    CompactRegionsResponse,
+    parse_compact_regions,
+)
 from .regions_error import RegionsError, RegionsErrorInfo
 from .regions_response import RegionsCountry, RegionsItem, RegionsResponse
@@ -0,0 +1,18 @@
+from pydantic import TypeAdapter
+
+from .regions_error import RegionsError
+from .regions_response import RegionsResponse
+
+REGIONS_RESULT_ADAPTER = TypeAdapter(RegionsResponse | RegionsError)
+
+
+def parse_regions(content: bytes | str) -> RegionsResponse:
+    return RegionsResponse.model_validate_json(content)
+
+
+def parse_regions_error(content: bytes | str) -> RegionsError:
+    return RegionsError.model_validate_json(content)
+
+
+def parse_regions_result(content: bytes | str) -> RegionsResponse | RegionsError:
+    return REGIONS_RESULT_ADAPTER.validate_json(content)
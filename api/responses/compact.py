@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+
+from pydantic import TypeAdapter
+
+_countries: dict['CompactRegionsCountry', 'CompactRegionsCountry'] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class CompactRegionsResponse:
+    total: int
+    items: tuple['CompactRegionsItem', ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CompactRegionsItem:
+    id: int
+    name: str
+    code: str
+    country: 'CompactRegionsCountry'
+
+    def __post_init__(self):
+        object.__setattr__(self, 'country', intern_country(self.country))
+
+
+@dataclass(frozen=True, slots=True)
+class CompactRegionsCountry:
+    name: str
+    code: str
+
+
+def intern_country(country: CompactRegionsCountry) -> CompactRegionsCountry:
+    """
+    Single shared instance per country, so items of the same country don't hold own copies
+    """
+
+    return _countries.setdefault(country, country)
+
+
+COMPACT_REGIONS_ADAPTER = TypeAdapter(CompactRegionsResponse)
+
+
+def parse_compact_regions(content: bytes | str) -> CompactRegionsResponse:
+    return COMPACT_REGIONS_ADAPTER.validate_json(content)
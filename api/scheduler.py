@@ -0,0 +1,224 @@
+import asyncio
+import random
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Awaitable, Callable, Union
+from urllib.parse import urlsplit
+
+import requests
+
+if TYPE_CHECKING:
+    import httpx
+
+Response = Union[requests.Response, 'httpx.Response']
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 1.0):
+        """
+        Client-side rate limit with additive increase and multiplicative decrease of the rate
+
+        :param rate: Maximal requests per second
+        :param burst: Number of requests that can be sent at once after idling
+        :param min_rate: Rate is never throttled below this one
+        """
+
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, possibly ahead of time
+
+        :return: Seconds to wait before sending the request
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def throttle(self) -> None:
+        """
+        Halve the rate after the server asked to slow down
+        """
+
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def recover(self) -> None:
+        """
+        Grow the rate back by a tenth of the maximal one after a successful request
+        """
+
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def _transport_errors() -> tuple[type[Exception], ...]:
+    import httpx
+
+    return requests.ConnectionError, requests.Timeout, httpx.TransportError
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 5
+    backoff: float = 0.2
+    max_backoff: float = 10.0
+    statuses: frozenset[int] = frozenset(
+        {
+            HTTPStatus.TOO_MANY_REQUESTS,
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+            HTTPStatus.BAD_GATEWAY,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            HTTPStatus.GATEWAY_TIMEOUT,
+        }
+    )
+    exceptions: tuple[type[Exception], ...] = field(default_factory=_transport_errors)
+
+    def delay(self, attempt: int, response: Response | None = None) -> float:
+        """
+        :param attempt: Number of the failed attempt, starting from 1
+        :param response: Failed response, if any
+        :return: Retry-After of the response if present, otherwise exponential backoff with full jitter
+        """
+
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+def _retry_after(response: Response) -> float | None:
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    if value.isdigit():
+        return float(value)
+
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class Scheduler:
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        retry: RetryPolicy | None = None,
+        max_concurrency_per_host: int | None = None,
+    ):
+        """
+        Rate limiting, retries and concurrency limit of idempotent requests
+
+        :param rate: Maximal requests per second, halved on 429 and grown back on success; not limited if omitted
+        :param burst: Number of requests that can be sent at once after idling
+        :param retry: Retry policy, default one if omitted
+        :param max_concurrency_per_host: Maximal number of requests in flight to a single host, not limited if omitted
+        """
+
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.retry = retry or RetryPolicy()
+        self.retries = 0
+        self._max_concurrency = max_concurrency_per_host
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._async_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def call(self, url: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        :param url: URL of the request, its host limits concurrency
+        :param send: Sends the request
+        :return: Last response, successful or not
+        :raises: Last exception of send, if every attempt raised one of RetryPolicy.exceptions
+        """
+
+        semaphore = self._semaphore(urlsplit(url).netloc)
+        for attempt in range(1, self.retry.attempts + 1):
+            if self.bucket is not None:
+                time.sleep(self.bucket.reserve())
+
+            try:
+                with semaphore or nullcontext():
+                    response = send()
+            except self.retry.exceptions:
+                if attempt == self.retry.attempts:
+                    raise
+                response = None
+
+            if not self._should_retry(attempt, response):
+                return response
+
+            # Release the connection of a retried response, a streamed one holds it until its body is read
+            if response is not None:
+                response.close()
+            time.sleep(self.retry.delay(attempt, response))
+
+    async def acall(self, url: str, send: Callable[[], Awaitable['httpx.Response']]) -> 'httpx.Response':
+        """
+        Same as call for coroutines
+        """
+
+        semaphore = self._async_semaphore(urlsplit(url).netloc)
+        for attempt in range(1, self.retry.attempts + 1):
+            if self.bucket is not None:
+                await asyncio.sleep(self.bucket.reserve())
+
+            try:
+                async with semaphore or nullcontext():
+                    response = await send()
+            except self.retry.exceptions:
+                if attempt == self.retry.attempts:
+                    raise
+                response = None
+
+            if not self._should_retry(attempt, response):
+                return response
+
+            if response is not None:
+                await response.aclose()
+            await asyncio.sleep(self.retry.delay(attempt, response))
+
+    def _should_retry(self, attempt: int, response: Response | None) -> bool:
+        retry = response is None or response.status_code in self.retry.statuses
+        if response is not None and self.bucket is not None:
+            # The rate grows back only on responses that are not failures, a failing server is not sent more
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                self.bucket.throttle()
+            elif not retry:
+                self.bucket.recover()
+
+        if retry and attempt < self.retry.attempts:
+            self.retries += 1
+            return True
+
+        return False
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore | None:
+        if self._max_concurrency is None:
+            return None
+
+        with self._lock:
+            return self._semaphores.setdefault(host, threading.BoundedSemaphore(self._max_concurrency))
+
+    def _async_semaphore(self, host: str) -> asyncio.Semaphore | None:
+        if self._max_concurrency is None:
+            return None
+
+        return self._async_semaphores.setdefault(host, asyncio.Semaphore(self._max_concurrency))
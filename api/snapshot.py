@@ -0,0 +1,176 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+
+from api.client import ApiClient
+
+SNAPSHOT_VERSION = 1
+
+# Total is cut out of the hashed body, so a region added to the last page doesn't change hashes of all pages
+_TOTAL = re.compile(rb'"total"\s*:\s*(\d+)')
+
+Region = tuple[str, str, str, str]
+
+
+@dataclass
+class PageState:
+    hash: str
+    etag: str | None
+    ids: list[int]
+
+
+@dataclass
+class Snapshot:
+    """
+    Regions of the whole catalogue by id with content hashes of the pages they were fetched on
+
+    :param page_size: Page size the catalogue was crawled with
+    :param total: Total reported by the API
+    :param pages: Pages in order
+    :param regions: Name, code, country code and country name by region id
+    """
+
+    page_size: int
+    total: int
+    pages: list[PageState] = field(default_factory=list)
+    regions: dict[int, Region] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'Snapshot':
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data['version'] != SNAPSHOT_VERSION:
+            raise ValueError(f'Snapshot version {data["version"]} is not supported')
+
+        return cls(
+            page_size=data['page_size'],
+            total=data['total'],
+            pages=[PageState(*page) for page in data['pages']],
+            regions={region_id: tuple(region) for region_id, *region in data['regions']},
+        )
+
+    def save(self, path: str | Path) -> None:
+        data = {
+            'version': SNAPSHOT_VERSION,
+            'page_size': self.page_size,
+            'total': self.total,
+            'pages': [[page.hash, page.etag, page.ids] for page in self.pages],
+            'regions': [[region_id, *region] for region_id, region in self.regions.items()],
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, separators=(',', ':'))
+
+
+@dataclass
+class SnapshotDiff:
+    added: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+    modified: list[int] = field(default_factory=list)
+    pages_changed: int = 0
+    pages_unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def report(self, before: Snapshot, after: Snapshot) -> list[str]:
+        """
+        :return: Lines describing every added, removed and modified region
+        """
+
+        lines = [f'+ {region_id} {after.regions[region_id]}' for region_id in self.added]
+        lines.extend(f'- {region_id} {before.regions[region_id]}' for region_id in self.removed)
+        lines.extend(
+            f'~ {region_id} {before.regions[region_id]} -> {after.regions[region_id]}' for region_id in self.modified
+        )
+        return lines
+
+
+class SnapshotCrawler:
+    def __init__(self, client: ApiClient, page_size: int):
+        """
+        Crawl of all pages of regions. Pages are requested with ETag of the previous snapshot,
+        and only pages whose content hash changed are decoded and compared.
+
+        :param client: Client the pages are requested with
+        :param page_size: Number of items per page
+        """
+
+        self._client = client
+        self._page_size = page_size
+
+    def crawl(self, previous: Snapshot | None = None) -> tuple[Snapshot, SnapshotDiff]:
+        """
+        :param previous: Snapshot of an earlier crawl, all regions are reported as added if omitted
+        :return: New snapshot and its difference from the previous one
+        :raises requests.HTTPError: If any page is not fetched successfully
+        """
+
+        previous_regions = previous.regions if previous else {}
+        previous_pages = previous.pages if previous and previous.page_size == self._page_size else []
+
+        snapshot = Snapshot(self._page_size, previous.total if previous else 0)
+        diff = SnapshotDiff()
+        changed_ids = []
+        page_number = 0
+        while True:
+            previous_page = previous_pages[page_number] if page_number < len(previous_pages) else None
+            page_number += 1
+            page, changed = self._fetch_page(page_number, previous_page, snapshot)
+            if not changed:
+                diff.pages_unchanged += 1
+                snapshot.regions.update((region_id, previous_regions[region_id]) for region_id in page.ids)
+            else:
+                diff.pages_changed += 1
+                changed_ids.extend(page.ids)
+
+            snapshot.pages.append(page)
+            if len(page.ids) < self._page_size:
+                break
+
+        for region_id in changed_ids:
+            before = previous_regions.get(region_id)
+            if before is None:
+                diff.added.append(region_id)
+            elif before != snapshot.regions[region_id]:
+                diff.modified.append(region_id)
+        diff.removed = sorted(previous_regions.keys() - snapshot.regions.keys())
+
+        return snapshot, diff
+
+    def _fetch_page(
+        self,
+        page_number: int,
+        previous_page: PageState | None,
+        snapshot: Snapshot,
+    ) -> tuple[PageState, bool]:
+        """
+        Regions of a changed page are added to the snapshot, ones of an unchanged page are left to the caller
+
+        :return: State of the page and whether it changed
+        """
+
+        headers = {'If-None-Match': previous_page.etag} if previous_page and previous_page.etag else None
+        response = self._client.get_regions(page=page_number, page_size=self._page_size, headers=headers)
+        if previous_page is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            return previous_page, False
+        response.raise_for_status()
+
+        content = response.content
+        etag = response.headers.get('ETag')
+        total = _TOTAL.search(content)
+        digest = hashlib.blake2b(_TOTAL.sub(b'', content, count=1), digest_size=16).hexdigest()
+        if previous_page is not None and digest == previous_page.hash and total is not None:
+            snapshot.total = int(total.group(1))
+            return PageState(digest, etag, previous_page.ids), False
+
+        regions = self._client.parse_compact_regions(response)
+        snapshot.total = regions.total
+        for item in regions.items:
+            snapshot.regions[item.id] = (item.name, item.code, item.country.code, item.country.name)
+
+        return PageState(digest, etag, [item.id for item in regions.items]), True
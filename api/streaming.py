@@ -0,0 +1,170 @@
+import codecs
+import json
+import re
+from typing import Any, Iterator
+
+import requests
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_KEY = re.compile(r'"((?:[^"\\]|\\.)*)"[ \t\n\r]*:')
+_DELIMITERS = frozenset(',]} \t\n\r')
+
+
+class ResponseTooLarge(requests.RequestException):
+    """
+    Body of the response exceeds the allowed size
+    """
+
+
+class ItemsParser:
+    def __init__(self):
+        """
+        Incremental parser of the items array of a regions page body fed in arbitrary chunks.
+        Only the unparsed tail of the body is buffered, decoded items are returned as soon as they are complete.
+        """
+
+        self.fields: dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key: str | None = None
+
+    def feed(self, text: str) -> list[Any]:
+        """
+        :param text: Next chunk of the body
+        :return: Items completed by the chunk
+        """
+
+        start = self._pos
+        self._buffer = self._buffer[start:] + text
+        self._pos = 0
+        items = []
+        while self._step(items):
+            pass
+
+        return items
+
+    def close(self) -> None:
+        """
+        :raises ValueError: If the body fed so far is not a complete JSON object
+        """
+
+        if self._state != 'done':
+            start = self._pos
+            raise ValueError(f'Incomplete or invalid body at {self._buffer[start:][:50]!r}')
+
+    def _step(self, items: list[Any]) -> bool:
+        """
+        Consume one token of the buffer
+
+        :return: Whether anything was consumed, False if more data is needed
+        """
+
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        if self._pos == len(self._buffer) or self._state == 'done':
+            return False
+
+        char = self._buffer[self._pos]
+        if self._state == 'start':
+            return self._expect(char, '{', 'key')
+        if self._state == 'key':
+            return self._step_key(char)
+        if self._state == 'value':
+            return self._step_value(char)
+
+        if char in ',]':
+            self._state = 'key' if char == ']' else 'items'
+            self._pos += 1
+            return True
+
+        item = self._decode()
+        if item is None:
+            return False
+        items.append(item[0])
+        return True
+
+    def _expect(self, char: str, expected: str, state: str) -> bool:
+        if char != expected:
+            return False
+
+        self._state = state
+        self._pos += 1
+        return True
+
+    def _step_value(self, char: str) -> bool:
+        if self._key == 'items':
+            return self._expect(char, '[', 'items')
+
+        value = self._decode()
+        if value is None:
+            return False
+
+        self.fields[self._key] = value[0]
+        self._state = 'key'
+        return True
+
+    def _step_key(self, char: str) -> bool:
+        if char in ',}':
+            self._state = 'key' if char == ',' else 'done'
+            self._pos += 1
+            return True
+
+        match = _KEY.match(self._buffer, self._pos)
+        if match is None:
+            return False
+
+        self._key = json.loads(f'"{match.group(1)}"')
+        self._state = 'value'
+        self._pos = match.end()
+        return True
+
+    def _decode(self) -> tuple[Any] | None:
+        """
+        :return: Decoded value in a tuple, None if the value is not complete yet
+        """
+
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return None
+
+        # A number is complete only once a delimiter follows it, until then the next chunk may continue it
+        if end == len(self._buffer) or self._buffer[end] not in _DELIMITERS:
+            return None
+
+        self._pos = end
+        return (value,)
+
+
+def iter_items(response: requests.Response, max_body_size: int | None = None, chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Items of a regions page body decoded incrementally as it arrives from a streamed response
+
+    :param response: Response of a request sent with stream=True
+    :param max_body_size: Maximal number of body bytes, unlimited if omitted
+    :param chunk_size: Number of bytes read from the socket at once
+    :raises ResponseTooLarge: If Content-Length or the number of read bytes exceeds max_body_size
+    :raises ValueError: If the body is not a complete JSON object
+    """
+
+    content_length = response.headers.get('Content-Length')
+    if max_body_size is not None and content_length is not None and int(content_length) > max_body_size:
+        raise ResponseTooLarge(
+            f'Content-Length {content_length} exceeds {max_body_size} bytes',
+            request=response.request,
+            response=response,
+        )
+
+    parser = ItemsParser()
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+    size = 0
+    for chunk in response.iter_content(chunk_size):
+        size += len(chunk)
+        if max_body_size is not None and size > max_body_size:
+            raise ResponseTooLarge(f'Body exceeds {max_body_size} bytes', request=response.request, response=response)
+
+        yield from parser.feed(decoder.decode(chunk))
+
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
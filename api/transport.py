@@ -0,0 +1,143 @@
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+import httpx
+import requests
+
+from api.instrumentation import ConnectionStats, InstrumentedAdapter, RequestMetrics
+
+# Content codings decoded by both urllib3 and httpx, br only with brotli installed
+_DECODERS = {'gzip': None, 'deflate': None, 'br': 'brotli'}
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """
+    Connection pooling, keep-alive, compression and HTTP version of the clients
+
+    :param pool_connections: Number of hosts a session keeps a pool of connections for
+    :param pool_size: Maximal number of connections to a host
+    :param keep_alive: Reuse connections between requests, every request opens a new one otherwise
+    :param keep_alive_expiry: Seconds an idle connection of the async client is kept for
+    :param compression: Accepted content codings, ones without an installed decoder are not offered
+    :param http2: Negotiate HTTP/2 in the async client if h2 is installed, HTTP/1.1 is used otherwise
+    """
+
+    pool_connections: int = 10
+    pool_size: int = 10
+    keep_alive: bool = True
+    keep_alive_expiry: float = 5.0
+    compression: tuple[str, ...] = ('gzip', 'deflate', 'br')
+    http2: bool = False
+
+    @property
+    def accept_encoding(self) -> str:
+        return ', '.join(
+            coding
+            for coding in self.compression
+            if coding in _DECODERS and (_DECODERS[coding] is None or _installed(_DECODERS[coding]))
+        )
+
+    @property
+    def uses_http2(self) -> bool:
+        return self.http2 and _installed('h2')
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {'Accept-Encoding': self.accept_encoding or 'identity'}
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+
+        return headers
+
+    def adapter(self, metrics: RequestMetrics) -> InstrumentedAdapter:
+        """
+        :param metrics: Recorder of timings and connection reuse
+        :return: Instrumented transport adapter with pools of the configured size
+        """
+
+        return InstrumentedAdapter(metrics, pool_connections=self.pool_connections, pool_maxsize=self.pool_size)
+
+    def configure(self, session: requests.Session, adapter: requests.adapters.BaseAdapter) -> requests.Session:
+        """
+        Mount the adapter for http and https and set the negotiation headers of the session
+        """
+
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def session(self, metrics: RequestMetrics) -> requests.Session:
+        return self.configure(requests.Session(), self.adapter(metrics))
+
+    def async_client(self, stats: ConnectionStats | None = None) -> httpx.AsyncClient:
+        """
+        :param stats: Counters of new and reused connections and bytes over the wire, not counted if omitted
+        """
+
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size if self.keep_alive else 0,
+                keepalive_expiry=self.keep_alive_expiry,
+            ),
+            http2=self.uses_http2,
+        )
+        if stats is not None:
+            transport = CountingTransport(transport, stats)
+
+        return httpx.AsyncClient(transport=transport, headers=self.headers)
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: ConnectionStats):
+        """
+        Transport counting requests sent over new and reused connections by httpcore trace events
+        and raw body bytes as they are read, before content decoding
+
+        :param transport: Transport requests are sent with
+        :param stats: Counters to update
+        """
+
+        self._transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        connected = False
+        outer_trace = request.extensions.get('trace')
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal connected
+            if event_name == 'connection.connect_tcp.complete':
+                connected = True
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions = {**request.extensions, 'trace': trace}
+        response = await self._transport.handle_async_request(request)
+        self._stats.record(connected)
+        response.stream = _CountingStream(response.stream, self._stats)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, stats: ConnectionStats):
+        self._stream = stream
+        self._stats = stats
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._stats.received(len(chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
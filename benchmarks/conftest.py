@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+import requests
+
+from api.client import ApiClient
+from benchmarks.constants import LARGE_CATALOGUE_SIZE
+from stub.dataset import load_regions
+from stub.server import RegionsStubServer
+from test_data.synthetic import make_regions_payload
+
+
+@pytest.fixture(scope='session')
+def stub_server() -> RegionsStubServer:
+    with RegionsStubServer() as server:
+        yield server
+
+
+@pytest.fixture(scope='session')
+def large_stub_server() -> RegionsStubServer:
+    with RegionsStubServer(load_regions(LARGE_CATALOGUE_SIZE)) as server:
+        yield server
+
+
+@pytest.fixture
+def session() -> requests.Session:
+    with requests.Session() as session:
+        yield session
+
+
+@pytest.fixture
+def client(session: requests.Session, stub_server: RegionsStubServer) -> ApiClient:
+    return ApiClient(session, host=stub_server.url)
+
+
+@pytest.fixture
+def large_client(session: requests.Session, large_stub_server: RegionsStubServer) -> ApiClient:
+    return ApiClient(session, host=large_stub_server.url)
+
+
+@pytest.fixture(scope='session')
+def page_payload() -> bytes:
+    return make_regions_payload(15)
+
+
+@pytest.fixture(scope='session')
+def large_payload() -> bytes:
+    return make_regions_payload(10_000)
+
+
+@pytest.fixture
+def quiet_logger() -> logging.Logger:
+    logger = logging.getLogger('benchmarks.quiet')
+    logger.disabled = True
+    return logger
@@ -0,0 +1 @@
+LARGE_CATALOGUE_SIZE = 3_000
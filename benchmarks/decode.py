@@ -0,0 +1,39 @@
+"""
+Per-response decode cost of GET /1.0/regions bodies
+
+Usage: python -m benchmarks.decode [--sizes 15 1000 100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import timeit
+
+from api.responses import REGIONS_RESULT_ADAPTER, RegionsResponse, parse_compact_regions, parse_regions
+from test_data.synthetic import make_regions_payload
+
+DECODERS = {
+    'json + model_validate': lambda content: RegionsResponse.model_validate(json.loads(content)),
+    'model_validate_json': parse_regions,
+    'result adapter': REGIONS_RESULT_ADAPTER.validate_json,
+    'compact': parse_compact_regions,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[15, 1_000, 100_000], help='Items per payload')
+    parser.add_argument('--repeat', type=int, default=5, help='Best of repeats is reported')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        content = make_regions_payload(size)
+        print(f'{size} items, {len(content) / 1024:.1f} KiB')
+        for name, decode in DECODERS.items():
+            timer = timeit.Timer(lambda: decode(content))
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat=args.repeat, number=number)) / number
+            print(f'  {name:<24} {best * 1e3:10.3f} ms  {best / size * 1e6:8.3f} us/item')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Import time budget of the project modules
+
+Every module is imported in a fresh interpreter, the best cumulative time of the runs is compared
+with its budget, and with the time of a previous run if a baseline is given,
+and modules that must stay lazy are checked not to be imported on the way.
+
+Usage: python -m benchmarks.import_time [--repeat 5] [--output times.json] [--baseline previous.json [--tolerance 0.5]]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# About twice the best times measured, which vary by a third between runs on the same machine.
+# Eager imports are caught by LAZY_MODULES, the budgets only catch a module getting much heavier
+BUDGETS_MS = {
+    'settings': 500,
+    'api.client': 400,
+    'api.async_client': 500,
+    'api.responses': 400,
+}
+
+LAZY_MODULES = {
+    'api.client': ('pydantic', 'pydantic_settings', 'httpx', 'allure', 'numpy'),
+    'api.async_client': ('pydantic', 'pydantic_settings', 'allure', 'numpy'),
+}
+
+_PROBE = 'import sys, json, {module}; print(json.dumps([name for name in {lazy!r} if name in sys.modules]))'
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    """
+    :return: Cumulative import time in milliseconds and imported modules which must stay lazy
+    """
+
+    probe = _PROBE.format(module=module, lazy=LAZY_MODULES.get(module, ()))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split('|')
+        if name.rstrip() == f' {module}':
+            return int(cumulative) / 1e3, json.loads(result.stdout)
+
+    raise RuntimeError(f'No import time of {module} in:\n{result.stderr}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Best of repeats is compared with the budget')
+    parser.add_argument('--output', default=None, help='File to write best times to, to be a baseline of later runs')
+    parser.add_argument('--baseline', default=None, help='Best times of a previous run on the same machine')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed relative slowdown against the baseline')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    failed = False
+    times = {}
+    for module, budget in BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(args.repeat)]
+        best = times[module] = min(elapsed for elapsed, _ in runs)
+        eager = runs[0][1]
+        limit = min(budget, baseline[module] * (1 + args.tolerance)) if module in baseline else budget
+
+        status = 'ok' if best <= limit and not eager else 'FAIL'
+        failed = failed or status == 'FAIL'
+        eager_message = f', imports {", ".join(eager)}' if eager else ''
+        print(f'{module:<20} {best:8.1f} ms / {limit:.0f} ms {status}{eager_message}')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(times, file, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+from http import HTTPStatus
+
+from api.client import ApiClient
+
+
+def test_get_regions_default_page(benchmark, client: ApiClient):
+    response = benchmark(client.get_regions)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_get_regions_with_q(benchmark, client: ApiClient):
+    response = benchmark(client.get_regions, q='нов')
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_get_regions_error(benchmark, client: ApiClient):
+    response = benchmark(client.get_regions, page_size=3)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_and_parse_regions(benchmark, client: ApiClient):
+    regions = benchmark(lambda: client.parse_regions(client.get_regions()))
+    assert regions.items
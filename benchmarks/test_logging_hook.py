@@ -0,0 +1,26 @@
+import logging
+
+import pytest
+import requests
+
+from api.client import ApiClient
+from api.instrumentation import ResponseLogger
+
+
+@pytest.mark.parametrize('page_size', (5, 15))
+def test_response_logger(benchmark, client: ApiClient, quiet_logger: logging.Logger, page_size):
+    response = client.get_regions(page_size=page_size)
+    log_response = ResponseLogger(quiet_logger)
+
+    assert benchmark(log_response, response) is response
+
+
+def test_response_text_logging(benchmark, client: ApiClient, quiet_logger: logging.Logger):
+    response = client.get_regions()
+
+    def log_response(r: requests.Response) -> requests.Response:
+        quiet_logger.info(f'Request: {r.request.method} {r.request.url}')
+        quiet_logger.info(f'Response: {r.status_code} {r.text}')
+        return r
+
+    assert benchmark(log_response, response) is response
@@ -0,0 +1,24 @@
+from api.client import ApiClient
+from api.pagination import check_pages
+from api.responses import CompactRegionsResponse, parse_compact_regions
+from benchmarks.constants import LARGE_CATALOGUE_SIZE
+from test_data.synthetic import make_regions_payload
+
+
+def test_walk_all_pages(benchmark, large_client: ApiClient):
+    items = benchmark.pedantic(lambda: sum(1 for _ in large_client.iter_regions()), rounds=3)
+    assert items == LARGE_CATALOGUE_SIZE
+
+
+def test_check_pages(benchmark):
+    page_size = 15
+    catalogue = parse_compact_regions(make_regions_payload(100_000))
+    pages = [
+        CompactRegionsResponse(total=catalogue.total, items=catalogue.items[start:end])
+        for start, end in zip(
+            range(0, catalogue.total, page_size), range(page_size, catalogue.total + page_size, page_size)
+        )
+    ]
+
+    report = benchmark(check_pages, pages, page_size, total=catalogue.total)
+    assert report.ok, report.violations
@@ -0,0 +1,50 @@
+import json
+import uuid
+
+import pytest
+
+from api.responses import (
+    RegionsError,
+    RegionsResponse,
+    parse_compact_regions,
+    parse_regions,
+    parse_regions_error,
+    parse_regions_result,
+)
+from test_data.regions import RegionsErrorMessages
+
+ERROR_PAYLOAD = json.dumps(
+    {'error': {'id': str(uuid.uuid4()), 'message': RegionsErrorMessages.UNACCEPTABLE_PAGE_SIZE}},
+    ensure_ascii=False,
+).encode()
+
+
+@pytest.mark.parametrize('payload', ('page_payload', 'large_payload'))
+def test_regions_response_validation(benchmark, request, payload):
+    content = request.getfixturevalue(payload)
+    regions = benchmark(parse_regions, content)
+    assert isinstance(regions, RegionsResponse)
+
+
+@pytest.mark.parametrize('payload', ('page_payload', 'large_payload'))
+def test_regions_response_dict_validation(benchmark, request, payload):
+    content = request.getfixturevalue(payload)
+    regions = benchmark(lambda: RegionsResponse.model_validate(json.loads(content)))
+    assert isinstance(regions, RegionsResponse)
+
+
+@pytest.mark.parametrize('payload', ('page_payload', 'large_payload'))
+def test_compact_regions_validation(benchmark, request, payload):
+    content = request.getfixturevalue(payload)
+    regions = benchmark(parse_compact_regions, content)
+    assert regions.items
+
+
+def test_regions_error_validation(benchmark):
+    error = benchmark(parse_regions_error, ERROR_PAYLOAD)
+    assert isinstance(error, RegionsError)
+
+
+def test_regions_result_validation(benchmark):
+    error = benchmark(parse_regions_result, ERROR_PAYLOAD)
+    assert isinstance(error, RegionsError)
@@ -0,0 +1,181 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+REPORT_MODES = 'full', 'lean'
+
+
+@dataclass
+class _Step:
+    title: str
+    params: dict[str, Any]
+    start: float
+    stop: float | None = None
+    error: BaseException | None = None
+    steps: list['_Step'] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.title.format(**self.params)
+
+
+class Reporter:
+    def __init__(self, mode: str = 'full'):
+        """
+        Steps and attachments of the current test buffered in memory and written to allure at once by flush
+
+        :param mode: full - every step, with its recorded start and stop, and every attachment is reported,
+            lean - only failing steps and timings of steps of failed tests are reported
+        """
+
+        self.mode = mode
+        self.timings: dict[str, list[float]] = defaultdict(list)
+        self._steps: list[_Step] = []
+        self._stack: list[_Step] = []
+        self._failed: list[dict[str, str]] = []
+        self._errors: list[BaseException] = []
+        self._attachments: list[tuple[str, str]] = []
+        self._test_timings: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def step(self, title: str, **params: Any) -> Iterator[None]:
+        """
+        :param title: Title of the step, formatted with params only when it is reported
+        :param params: Values of the title fields
+        """
+
+        step = _Step(title, params, time.time())
+        (self._stack[-1].steps if self._stack else self._steps).append(step)
+        self._stack.append(step)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as error:
+            # Outer steps see the same error, it is reported once with the path to the innermost step
+            step.error = error
+            if not any(error is reported for reported in self._errors):
+                self._errors.append(error)
+                path = ' > '.join(stack_step.name for stack_step in self._stack)
+                self._failed.append({'step': path, 'error': f'{type(error).__name__}: {error}'})
+            raise
+        finally:
+            step.stop = time.time()
+            self._test_timings[title].append(time.perf_counter() - start)
+            self._stack.pop()
+
+    def attach(self, name: str, body: str) -> None:
+        """
+        Buffer a JSON attachment of the current test
+        """
+
+        self._attachments.append((name, body))
+
+    def flush(self, failed: bool) -> None:
+        """
+        Write buffered steps and attachments of the current test
+
+        :param failed: Whether the test failed, nothing is written for passed tests in lean mode
+        """
+
+        steps, attachments = self._steps, self._attachments
+        if self.mode == 'lean':
+            steps, attachments = [], []
+            # A test failed outside of steps, in setup for example, has no failed steps to report
+            if failed and self._failed:
+                report = {
+                    'failed steps': self._failed,
+                    'step timings': timings_summary(self._test_timings),
+                    'attachments': {name: json.loads(body) for name, body in self._attachments},
+                }
+                attachments.append(('Steps', json.dumps(report, ensure_ascii=False, indent=2)))
+
+        _write_test(steps, attachments)
+
+        for title, durations in self._test_timings.items():
+            self.timings[title].extend(durations)
+        self._test_timings.clear()
+        self._steps = []
+        self._attachments = []
+        self._failed = []
+        self._errors = []
+
+
+def _write_test(steps: list[_Step], attachments: list[tuple[str, str]]) -> None:
+    """
+    Add steps and JSON attachments to the test allure-pytest is reporting,
+    nothing is written if it doesn't report to --alluredir
+    """
+
+    if not steps and not attachments:
+        return
+
+    from allure_commons import plugin_manager
+    from allure_commons.model2 import TestResult
+    from allure_commons.types import AttachmentType
+    from allure_commons.utils import uuid4
+
+    for plugin in plugin_manager.get_plugins():
+        logger = getattr(plugin, 'allure_logger', None)
+        test = logger.get_last_item(TestResult) if logger is not None else None
+        if test is not None:
+            for step in steps:
+                _write_step(logger, test.uuid, step)
+            # Attached to the test itself, the executable allure-pytest is reporting now is a fixture teardown
+            for name, body in attachments:
+                logger.attach_data(uuid4(), body, name=name, attachment_type=AttachmentType.JSON, parent_uuid=test.uuid)
+
+
+def _write_step(logger: Any, parent_uuid: str, step: _Step) -> None:
+    from allure_commons.model2 import TestStepResult
+    from allure_commons.utils import uuid4
+    from allure_pytest.utils import get_status, get_status_details
+
+    uuid = uuid4()
+    logger.start_step(parent_uuid, uuid, TestStepResult(name=step.name, start=_millis(step.start)))
+    for child in step.steps:
+        _write_step(logger, uuid, child)
+
+    error = step.error
+    details = get_status_details(type(error), error, error.__traceback__) if error is not None else None
+    logger.stop_step(uuid, stop=_millis(step.stop), status=get_status(error), statusDetails=details)
+
+
+def _millis(timestamp: float) -> int:
+    return round(timestamp * 1000)
+
+
+def timings_summary(timings: dict[str, list[float]]) -> dict[str, dict[str, float]]:
+    """
+    :return: Number of runs and total and maximal milliseconds by step title
+    """
+
+    return {
+        title: {
+            'count': len(durations),
+            'total_ms': round(sum(durations) * 1e3, 3),
+            'max_ms': round(max(durations) * 1e3, 3),
+        }
+        for title, durations in timings.items()
+    }
+
+
+reporter = Reporter()
+
+
+def step(title: str, **params: Any):
+    """
+    Step of the current test, see Reporter.step
+    """
+
+    return reporter.step(title, **params)
+
+
+def attach(name: str, body: str) -> None:
+    """
+    JSON attachment of the current test, see Reporter.attach
+    """
+
+    reporter.attach(name, body)
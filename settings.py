@@ -1,3 +1,5 @@
+from functools import cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,4 +12,17 @@ class Settings(BaseSettings):
     host: str
 
 
-settings = Settings()
+@cache
+def get_settings() -> Settings:
+    """
+    Settings read from environment and .env on first call
+    """
+
+    return Settings()
+
+
+def __getattr__(name: str):
+    if name == 'settings':
+        return get_settings()
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
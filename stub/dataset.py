@@ -0,0 +1,54 @@
+from test_data.synthetic import COUNTRIES, make_regions
+
+_DEFAULT_REGIONS = (
+    ('moscow', 'Москва', 'ru'),
+    ('spb', 'Санкт-Петербург', 'ru'),
+    ('novosibirsk', 'Новосибирск', 'ru'),
+    ('ekb', 'Екатеринбург', 'ru'),
+    ('n_novgorod', 'Нижний Новгород', 'ru'),
+    ('kazan', 'Казань', 'ru'),
+    ('chelyabinsk', 'Челябинск', 'ru'),
+    ('omsk', 'Омск', 'ru'),
+    ('samara', 'Самара', 'ru'),
+    ('rostov', 'Ростов-на-Дону', 'ru'),
+    ('ufa', 'Уфа', 'ru'),
+    ('krasnoyarsk', 'Красноярск', 'ru'),
+    ('perm', 'Пермь', 'ru'),
+    ('voronezh', 'Воронеж', 'ru'),
+    ('v_novgorod', 'Великий Новгород', 'ru'),
+    ('novorossiysk', 'Новороссийск', 'ru'),
+    ('bishkek', 'Бишкек', 'kg'),
+    ('osh', 'Ош', 'kg'),
+    ('astana', 'Астана', 'kz'),
+    ('almaty', 'Алматы', 'kz'),
+    ('karaganda', 'Караганда', 'kz'),
+    ('prague', 'Прага', 'cz'),
+)
+
+
+def default_regions() -> list[dict]:
+    """
+    Regions catalogue the tests are written against, see RegionsTestData.TOTAL_ITEMS
+    """
+
+    return [
+        {
+            'id': region_id,
+            'name': name,
+            'code': code,
+            'country': {'name': COUNTRIES[country_code], 'code': country_code},
+        }
+        for region_id, (code, name, country_code) in enumerate(_DEFAULT_REGIONS, start=1)
+    ]
+
+
+def load_regions(count: int | None = None, seed: int = 0) -> list[dict]:
+    """
+    :param count: Number of synthetic regions, default catalogue if omitted
+    :param seed: Seed of synthetic regions
+    """
+
+    if count is None:
+        return default_regions()
+
+    return make_regions(count, seed)
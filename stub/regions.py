@@ -0,0 +1,92 @@
+import json
+import re
+import uuid
+from http import HTTPStatus
+from typing import Mapping
+
+from test_data.regions import RegionsErrorMessages, RegionsTestData
+
+COUNTRY_CODES = 'ru', 'kg', 'kz', 'cz'
+Q_MIN_LENGTH = RegionsTestData.Q_MIN_LENGTH
+Q_MAX_LENGTH = RegionsTestData.Q_MAX_LENGTH
+
+_INTEGER = re.compile(r'-?[0-9]+')
+
+
+class RegionsHandler:
+    def __init__(self, regions: list[dict]):
+        """
+        Behaviour of GET /1.0/regions over the given catalogue:
+        q searches by name and ignores other params, total is always the size of the catalogue
+
+        :param regions: Items of the catalogue in order
+        """
+
+        self.total = len(regions)
+        self._names = [region['name'].lower() for region in regions]
+        self._items = [json.dumps(region, ensure_ascii=False, separators=(',', ':')) for region in regions]
+        self._by_country: dict[str, list[int]] = {code: [] for code in COUNTRY_CODES}
+        for index, region in enumerate(regions):
+            self._by_country.setdefault(region['country']['code'], []).append(index)
+
+    def handle(self, params: Mapping[str, str]) -> tuple[HTTPStatus, bytes]:
+        """
+        :param params: Query params, last value of repeated ones
+        :return: Status and JSON body
+        """
+
+        q = params.get('q')
+        if q is not None:
+            return self._search(q)
+
+        country_code = params.get('country_code')
+        if country_code is not None and country_code not in COUNTRY_CODES:
+            return self._error(RegionsErrorMessages.UNACCEPTABLE_COUNTRY_CODE)
+
+        page = _parse_int(params.get('page', str(RegionsTestData.DEFAULT_PAGE_NUMBER)))
+        if page is None:
+            return self._error(RegionsErrorMessages.NON_INTEGER_PAGE_NUMBER)
+        if page < 1:
+            return self._error(RegionsErrorMessages.PAGE_NUMBER_LESS_THAN_1)
+
+        page_size = _parse_int(params.get('page_size', str(RegionsTestData.DEFAULT_PAGE_SIZE)))
+        if page_size is None:
+            return self._error(RegionsErrorMessages.NON_INTEGER_PAGE_SIZE)
+        if page_size not in RegionsTestData.ACCEPTABLE_PAGES_SIZES:
+            return self._error(RegionsErrorMessages.UNACCEPTABLE_PAGE_SIZE)
+
+        start = (page - 1) * page_size
+        end = start + page_size
+        if country_code is None:
+            return self._page(range(start, min(end, self.total)))
+
+        return self._page(self._by_country[country_code][start:end])
+
+    def _search(self, q: str) -> tuple[HTTPStatus, bytes]:
+        if len(q) < Q_MIN_LENGTH:
+            return self._error(RegionsErrorMessages.Q_VALUE_LENGTH_LESS_THAN_3_SYMBOLS)
+        if len(q) > Q_MAX_LENGTH:
+            return self._error(RegionsErrorMessages.Q_VALUE_LENGTH_GRATER_THAN_30_SYMBOLS)
+
+        q = q.lower()
+        found = []
+        for index, name in enumerate(self._names):
+            if q in name:
+                found.append(index)
+                if len(found) == RegionsTestData.DEFAULT_PAGE_SIZE:
+                    break
+
+        return self._page(found)
+
+    def _page(self, indexes) -> tuple[HTTPStatus, bytes]:
+        items = ','.join(self._items[index] for index in indexes)
+        return HTTPStatus.OK, f'{{"total":{self.total},"items":[{items}]}}'.encode()
+
+    @staticmethod
+    def _error(message: str) -> tuple[HTTPStatus, bytes]:
+        body = {'error': {'id': str(uuid.uuid4()), 'message': message}}
+        return HTTPStatus.BAD_REQUEST, json.dumps(body, ensure_ascii=False).encode()
+
+
+def _parse_int(value: str) -> int | None:
+    return int(value) if _INTEGER.fullmatch(value) else None
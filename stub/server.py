@@ -0,0 +1,130 @@
+"""
+In-process stand-in of the Regions API
+
+Usage: python -m stub.server [--port 8080] [--regions COUNT] [--seed SEED]
+"""
+
+import argparse
+import hashlib
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from stub.dataset import load_regions
+from stub.regions import RegionsHandler
+
+REGIONS_PATH = '/1.0/regions'
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: '_Server'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != REGIONS_PATH:
+            self._send(HTTPStatus.NOT_FOUND, b'{}')
+            return
+
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        status, body = self.server.regions.handle(params)
+        if status != HTTPStatus.OK:
+            self._send(status, body)
+            return
+
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self._send(status, body, etag)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: HTTPStatus, body: bytes, etag: str | None = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], regions: RegionsHandler):
+        super().__init__(address, _RequestHandler)
+        self.regions = regions
+
+
+class RegionsStubServer:
+    def __init__(
+        self,
+        regions: list[dict] | None = None,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ):
+        """
+        :param regions: Catalogue of regions, default one of the tests if omitted
+        :param host: Interface to listen on
+        :param port: Port to listen on, a free one if 0
+        """
+
+        self._server = _Server((host, port), RegionsHandler(load_regions() if regions is None else regions))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> 'RegionsStubServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def serve_forever(self) -> None:
+        """
+        Serve in the current thread until interrupted
+        """
+
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on')
+    parser.add_argument('--regions', type=int, default=None, help='Number of synthetic regions')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of synthetic regions')
+    args = parser.parse_args()
+
+    server = RegionsStubServer(load_regions(args.regions, args.seed), args.host, args.port)
+    print(f'Serving {server.url}{REGIONS_PATH}')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+import itertools
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Sequence
+
+from test_data.regions import RegionsErrorMessages, RegionsTestData
+
+AFTER_LAST_PAGE = math.ceil(RegionsTestData.TOTAL_ITEMS / min(RegionsTestData.ACCEPTABLE_PAGES_SIZES)) + 1
+
+_INTEGER = re.compile(r'-?[0-9]+')
+
+
+@dataclass(frozen=True)
+class EquivalenceClass:
+    """
+    Values of a query param handled by the same code path of the endpoint
+
+    :param name: Name of the class
+    :param values: Representatives of the class sent by generated cases
+    :param contains: Whether a value, as it is sent in the query string, belongs to the class
+    :param error: Message of the 400 response to a value of the class, None for valid classes
+    :param overridden: Whether the overriding param is confirmed to make the endpoint ignore values of the class,
+        values of unconfirmed classes are not sent together with it
+    """
+
+    name: str
+    values: tuple
+    contains: Callable[[str], bool]
+    error: str | None = None
+    overridden: bool = True
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """
+    :param name: Query param name
+    :param classes: Classes of the param values, a value belongs to the first class that contains it
+    """
+
+    name: str
+    classes: tuple[EquivalenceClass, ...]
+
+    def classify(self, value: Any) -> EquivalenceClass:
+        text = value if isinstance(value, str) else str(value)
+        for equivalence_class in self.classes:
+            if equivalence_class.contains(text):
+                return equivalence_class
+
+        raise ValueError(f'{value!r} belongs to no class of {self.name!r}')
+
+
+@dataclass(frozen=True)
+class Case:
+    params: dict[str, Any]
+    error: str | None
+
+    @property
+    def id(self) -> str:
+        return ', '.join(f'{name}={_short_repr(value)}' for name, value in self.params.items()) or 'no params'
+
+    def __str__(self) -> str:
+        return self.id
+
+
+@dataclass(frozen=True)
+class Contract:
+    """
+    Query params of an endpoint
+
+    :param parameters: Params in order the endpoint validates them
+    :param overriding: Param which makes the endpoint ignore all other params when it is sent
+    """
+
+    parameters: tuple[Parameter, ...]
+    overriding: str | None = None
+
+    def effective_params(self, params: Mapping[str, Any]) -> dict[str, Any]:
+        """
+        Params the endpoint takes into account, omitted (None) and overridden ones are dropped
+        """
+
+        params = {name: value for name, value in params.items() if value is not None}
+        if self.overriding in params:
+            return {self.overriding: params[self.overriding]}
+
+        return params
+
+    def expected_error(self, params: Mapping[str, Any]) -> str | None:
+        """
+        :return: Error message of the response to params, None if the response is successful
+        """
+
+        params = self.effective_params(params)
+        for parameter in self.parameters:
+            if parameter.name in params:
+                error = parameter.classify(params[parameter.name]).error
+                if error is not None:
+                    return error
+
+        return None
+
+    def cases(self) -> list[Case]:
+        """
+        Cases covering every class of every param and every pair of valid classes of two params:
+        valid classes are combined pairwise, invalid values are sent one at a time,
+        and the overriding param is sent alone and together with every overridden class of the other params
+        """
+
+        cycles: dict[EquivalenceClass, itertools.cycle] = {}
+
+        def pick(equivalence_class: EquivalenceClass) -> Any:
+            if equivalence_class not in cycles:
+                cycles[equivalence_class] = itertools.cycle(equivalence_class.values)
+            return next(cycles[equivalence_class])
+
+        others = [parameter for parameter in self.parameters if parameter.name != self.overriding]
+        params_list = []
+
+        factors = [[None, *(c for c in parameter.classes if c.valid)] for parameter in others]
+        for row in pairwise_combinations(factors):
+            params_list.append({p.name: pick(c) for p, c in zip(others, row) if c is not None})
+
+        for parameter in self.parameters:
+            for equivalence_class in parameter.classes:
+                if parameter.name == self.overriding or not equivalence_class.valid:
+                    params_list.extend({parameter.name: value} for value in equivalence_class.values)
+
+        if self.overriding is not None:
+            overriding = next(parameter for parameter in self.parameters if parameter.name == self.overriding)
+            overriding_values = itertools.cycle(v for c in overriding.classes if c.valid for v in c.values)
+            for parameter in others:
+                for equivalence_class in (c for c in parameter.classes if c.overridden):
+                    params_list.append(
+                        {overriding.name: next(overriding_values), parameter.name: pick(equivalence_class)}
+                    )
+
+        return [Case(params, self.expected_error(params)) for params in params_list]
+
+
+def pairwise_combinations(factors: Sequence[Sequence]) -> list[tuple]:
+    """
+    Greedy reduction of the cross-product of factors to rows covering every level of every factor
+    and every pair of levels of two factors. Rows are picked from the whole cross-product, so factors should be few
+
+    :param factors: Levels of every factor
+    """
+
+    def pairs(row: tuple[int, ...]) -> set[tuple]:
+        singles = {(i, a) for i, a in enumerate(row)}
+        return singles | {(i, a, j, b) for (i, a), (j, b) in itertools.combinations(enumerate(row), 2)}
+
+    candidates = list(itertools.product(*(range(len(levels)) for levels in factors)))
+    uncovered = set().union(*map(pairs, candidates))
+    rows = []
+    while uncovered:
+        row = max(candidates, key=lambda candidate: len(pairs(candidate) & uncovered))
+        uncovered -= pairs(row)
+        rows.append(tuple(levels[index] for levels, index in zip(factors, row)))
+
+    return rows
+
+
+def _short_repr(value: Any) -> str:
+    if isinstance(value, str) and len(value) > 10:
+        return f'<{len(value)} symbols>'
+    return repr(value)
+
+
+def _is_integer(value: str) -> bool:
+    return _INTEGER.fullmatch(value) is not None
+
+
+REGIONS_CONTRACT = Contract(
+    parameters=(
+        Parameter(
+            'q',
+            (
+                EquivalenceClass(
+                    'shorter than min length',
+                    RegionsTestData.SHORT_Q_STRINGS,
+                    lambda v: len(v) < RegionsTestData.Q_MIN_LENGTH,
+                    RegionsErrorMessages.Q_VALUE_LENGTH_LESS_THAN_3_SYMBOLS,
+                ),
+                EquivalenceClass(
+                    'longer than max length',
+                    RegionsTestData.LONG_Q_STRINGS,
+                    lambda v: len(v) > RegionsTestData.Q_MAX_LENGTH,
+                    RegionsErrorMessages.Q_VALUE_LENGTH_GRATER_THAN_30_SYMBOLS,
+                ),
+                EquivalenceClass(
+                    'min length',
+                    tuple(q for q in RegionsTestData.Q_STRINGS if len(q) == RegionsTestData.Q_MIN_LENGTH),
+                    lambda v: len(v) == RegionsTestData.Q_MIN_LENGTH,
+                ),
+                EquivalenceClass(
+                    'max length',
+                    tuple(q for q in RegionsTestData.Q_STRINGS if len(q) == RegionsTestData.Q_MAX_LENGTH),
+                    lambda v: len(v) == RegionsTestData.Q_MAX_LENGTH,
+                ),
+                EquivalenceClass(
+                    'medium length',
+                    tuple(
+                        q
+                        for q in RegionsTestData.Q_STRINGS
+                        if RegionsTestData.Q_MIN_LENGTH < len(q) < RegionsTestData.Q_MAX_LENGTH
+                    ),
+                    lambda v: True,
+                ),
+            ),
+        ),
+        Parameter(
+            'country_code',
+            (
+                EquivalenceClass(
+                    'acceptable',
+                    RegionsTestData.ACCEPTABLE_COUNTRY_CODES,
+                    lambda v: v in RegionsTestData.ACCEPTABLE_COUNTRY_CODES,
+                ),
+                EquivalenceClass(
+                    'unacceptable',
+                    RegionsTestData.UNACCEPTABLE_COUNTRY_CODES + RegionsTestData.NON_EXISTING_COUNTRY_CODES,
+                    lambda v: True,
+                    RegionsErrorMessages.UNACCEPTABLE_COUNTRY_CODE,
+                ),
+            ),
+        ),
+        Parameter(
+            'page',
+            (
+                EquivalenceClass(
+                    'non-integer',
+                    RegionsTestData.NON_INTEGERS_VALUES,
+                    lambda v: not _is_integer(v),
+                    RegionsErrorMessages.NON_INTEGER_PAGE_NUMBER,
+                    overridden=False,
+                ),
+                EquivalenceClass(
+                    'less than 1',
+                    RegionsTestData.UNACCEPTABLE_PAGE_NUMBERS,
+                    lambda v: int(v) < 1,
+                    RegionsErrorMessages.PAGE_NUMBER_LESS_THAN_1,
+                ),
+                EquivalenceClass(
+                    'first',
+                    (RegionsTestData.DEFAULT_PAGE_NUMBER,),
+                    lambda v: int(v) == RegionsTestData.DEFAULT_PAGE_NUMBER,
+                ),
+                EquivalenceClass('following', (2, AFTER_LAST_PAGE), lambda v: True),
+            ),
+        ),
+        Parameter(
+            'page_size',
+            (
+                EquivalenceClass(
+                    'non-integer',
+                    RegionsTestData.NON_INTEGERS_VALUES,
+                    lambda v: not _is_integer(v),
+                    RegionsErrorMessages.NON_INTEGER_PAGE_SIZE,
+                    overridden=False,
+                ),
+                EquivalenceClass(
+                    'acceptable',
+                    RegionsTestData.ACCEPTABLE_PAGES_SIZES,
+                    lambda v: int(v) in RegionsTestData.ACCEPTABLE_PAGES_SIZES,
+                ),
+                EquivalenceClass(
+                    'unacceptable',
+                    RegionsTestData.UNACCEPTABLE_PAGES_SIZES,
+                    lambda v: True,
+                    RegionsErrorMessages.UNACCEPTABLE_PAGE_SIZE,
+                ),
+            ),
+        ),
+    ),
+    overriding='q',
+)
+
+
+if __name__ == '__main__':
+    cases = REGIONS_CONTRACT.cases()
+    print(f'{len(cases)} cases, {sum(case.error is None for case in cases)} valid')
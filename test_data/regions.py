@@ -10,8 +10,14 @@ class RegionsTestData:
         'max value',
     )
 
+    Q_MIN_LENGTH = 3
+    Q_MAX_LENGTH = 30
+    SHORT_Q_STRINGS = '1', '12'
+    LONG_Q_STRINGS = ('a' * 31,)
+
     ACCEPTABLE_COUNTRY_CODES = 'cz', 'kg', 'kz', 'ru'
     UNACCEPTABLE_COUNTRY_CODES = ('ua',)
+    NON_EXISTING_COUNTRY_CODES = 'yz', ''
 
     DEFAULT_PAGE_NUMBER = 1
     UNACCEPTABLE_PAGE_NUMBERS = -3, 0
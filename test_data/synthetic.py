@@ -0,0 +1,45 @@
+import json
+import random
+
+COUNTRIES = {
+    'cz': 'Чехия',
+    'kg': 'Кыргызстан',
+    'kz': 'Казахстан',
+    'ru': 'Россия',
+}
+
+_SYLLABLES = 'но', 'во', 'си', 'бир', 'ск', 'ка', 'за', 'нь', 'ми', 'ра', 'го', 'ро', 'д', 'ан', 'тер'
+
+
+def make_regions(count: int, seed: int = 0) -> list[dict]:
+    """
+    Deterministic regions items in the format of GET /1.0/regions
+
+    :param count: Number of regions
+    :param seed: Seed of names and countries
+    """
+
+    rnd = random.Random(seed)
+    country_codes = sorted(COUNTRIES)
+    regions = []
+    for region_id in range(1, count + 1):
+        name = ''.join(rnd.choice(_SYLLABLES) for _ in range(rnd.randint(2, 5))).capitalize()
+        country_code = rnd.choice(country_codes)
+        regions.append(
+            {
+                'id': region_id,
+                'name': name,
+                'code': f'{name.lower()}-{region_id}',
+                'country': {'name': COUNTRIES[country_code], 'code': country_code},
+            }
+        )
+
+    return regions
+
+
+def make_regions_payload(count: int, seed: int = 0) -> bytes:
+    """
+    Body of GET /1.0/regions with all count regions on a single page
+    """
+
+    return json.dumps({'total': count, 'items': make_regions(count, seed)}, ensure_ascii=False).encode()
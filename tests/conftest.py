@@ -1,26 +1,260 @@
+import json
 import logging
 
 import pytest
 import requests
 
+from api.cache import ResponseCache, SharedResponseCache
+from api.cassette import MODES, REPLAY_HOST, Cassette, CassetteAdapter
 from api.client import ApiClient
+from api.instrumentation import RequestMetrics, ResponseLogger
+from api.scheduler import RetryPolicy, Scheduler
+from api.transport import TransportConfig
+from reporting import REPORT_MODES, Reporter, reporter, timings_summary
+from stub.dataset import load_regions
+from stub.server import RegionsStubServer
 
 logger = logging.getLogger(__name__)
 
 
-@pytest.fixture
-def session() -> requests.Session:
-    def log_response(r, *args, **kwargs):
-        logger.info(f'Request: {r.request.method} {r.request.url}')
-        logger.info(f'Response: {r.status_code} {r.text}')
-        return r
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        '--cache-responses',
+        action='store_true',
+        help='Send requests with the same query params once per session',
+    )
+    parser.addoption(
+        '--cache-ttl',
+        type=float,
+        default=None,
+        help='Seconds a cached response is reused for, whole session by default',
+    )
+    parser.addoption(
+        '--cache-shared',
+        action='store_true',
+        help='Same as --cache-responses, but responses are shared by all xdist workers of the run',
+    )
+    parser.addoption(
+        '--stub',
+        action='store_true',
+        help='Run against the in-process stand-in of the Regions API instead of HOST',
+    )
+    parser.addoption(
+        '--stub-regions',
+        type=int,
+        default=None,
+        help='Number of synthetic regions served by the stand-in, default catalogue by default',
+    )
+    parser.addoption(
+        '--stub-seed',
+        type=int,
+        default=0,
+        help='Seed of synthetic regions served by the stand-in',
+    )
+    parser.addoption(
+        '--cassette',
+        default=None,
+        help='File to replay responses from and record them to',
+    )
+    parser.addoption(
+        '--cassette-mode',
+        choices=MODES,
+        default='record',
+        help='record - replay recorded responses and record missing ones, replay - never send requests, '
+        'refresh - send every request and record its response over the recorded one',
+    )
+    parser.addoption(
+        '--retries',
+        type=int,
+        default=0,
+        help='Number of retries of requests failed with 429, 5xx or a connection error',
+    )
+    parser.addoption(
+        '--rate-limit',
+        type=float,
+        default=None,
+        help='Maximal requests per second of every worker, halved on 429 and grown back on success',
+    )
+    parser.addoption(
+        '--max-body-size',
+        type=int,
+        default=None,
+        help='Maximal number of body bytes of streamed pages, unlimited by default',
+    )
+    parser.addoption(
+        '--pool-size',
+        type=int,
+        default=10,
+        help='Maximal number of connections of the session to a host',
+    )
+    parser.addoption(
+        '--no-keep-alive',
+        action='store_true',
+        help='Open a new connection for every request',
+    )
+    parser.addoption(
+        '--log-body-limit',
+        type=int,
+        default=1000,
+        help='Maximal number of logged bytes of a response body',
+    )
+    parser.addoption(
+        '--log-body-sample',
+        type=float,
+        default=1.0,
+        help='Share of successful responses with logged body, bodies of errors are always logged',
+    )
+    parser.addoption(
+        '--report-mode',
+        choices=REPORT_MODES,
+        default='full',
+        help='full - report every step and attachment, lean - report only failing steps and timings of failed tests',
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    reporter.mode = config.getoption('--report-mode')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    outcome = yield
+    if outcome.get_result().failed:
+        item.report_failed = True
+
+
+@pytest.fixture(scope='session')
+def host(pytestconfig: pytest.Config) -> str | None:
+    if not pytestconfig.getoption('--stub'):
+        replay = pytestconfig.getoption('--cassette') and pytestconfig.getoption('--cassette-mode') == 'replay'
+        yield REPLAY_HOST if replay else None
+        return
+
+    regions = load_regions(pytestconfig.getoption('--stub-regions'), pytestconfig.getoption('--stub-seed'))
+    with RegionsStubServer(regions) as server:
+        yield server.url
+
+
+@pytest.fixture(scope='session')
+def stub_host() -> str:
+    # Stand-in with the default catalogue for tests of the clients themselves, whatever host the API tests use
+    with RegionsStubServer() as server:
+        yield server.url
+
+
+@pytest.fixture(scope='session')
+def response_cache(
+    pytestconfig: pytest.Config,
+    tmp_path_factory: pytest.TempPathFactory,
+    worker_id: str,
+) -> ResponseCache | SharedResponseCache | None:
+    ttl = pytestconfig.getoption('--cache-ttl')
+    if pytestconfig.getoption('--cache-shared'):
+        run_dir = tmp_path_factory.getbasetemp()
+        if worker_id != 'master':
+            run_dir = run_dir.parent
+
+        cache = SharedResponseCache(run_dir / 'responses.sqlite', ttl=ttl)
+    elif pytestconfig.getoption('--cache-responses'):
+        cache = ResponseCache(ttl=ttl)
+    else:
+        yield None
+        return
+
+    yield cache
+
+    logger.info(f'Response cache: {cache.hits} hits, {cache.misses} misses')
+    if isinstance(cache, SharedResponseCache):
+        cache.close()
+
+
+@pytest.fixture(scope='session')
+def scheduler(pytestconfig: pytest.Config) -> Scheduler | None:
+    retries = pytestconfig.getoption('--retries')
+    rate = pytestconfig.getoption('--rate-limit')
+    if not retries and not rate:
+        return None
 
-    session = requests.Session()
+    return Scheduler(rate=rate, retry=RetryPolicy(attempts=retries + 1))
+
+
+@pytest.fixture(scope='session')
+def request_metrics() -> RequestMetrics:
+    metrics = RequestMetrics()
+    yield metrics
+
+    for endpoint, summary in metrics.summary(metrics.timings).items():
+        logger.info(f'Timings of {endpoint}: {json.dumps(summary)}')
+    if metrics.timings:
+        logger.info(f'Connections: {json.dumps(metrics.connections.summary())}')
+
+
+@pytest.fixture(scope='session')
+def session_reporter() -> Reporter:
+    yield reporter
+
+    if reporter.timings:
+        logger.info(f'Step timings: {json.dumps(timings_summary(reporter.timings), ensure_ascii=False)}')
+
+
+@pytest.fixture(autouse=True)
+def step_reporter(request: pytest.FixtureRequest, session_reporter: Reporter) -> Reporter:
+    yield session_reporter
+
+    session_reporter.flush(failed=getattr(request.node, 'report_failed', False))
+
+
+@pytest.fixture(autouse=True)
+def request_timings(request: pytest.FixtureRequest, request_metrics: RequestMetrics, step_reporter: Reporter):
+    request_metrics.current_test = request.node.nodeid
+    yield
+
+    request_metrics.current_test = None
+    timings = request_metrics.for_test(request.node.nodeid)
+    if timings:
+        step_reporter.attach('Request timings', json.dumps(request_metrics.summary(timings), indent=2))
+
+
+@pytest.fixture(scope='session')
+def session(pytestconfig: pytest.Config, request_metrics: RequestMetrics) -> requests.Session:
+    log_response = ResponseLogger(
+        logger,
+        body_limit=pytestconfig.getoption('--log-body-limit'),
+        sample_rate=pytestconfig.getoption('--log-body-sample'),
+    )
+
+    transport = TransportConfig(
+        pool_size=pytestconfig.getoption('--pool-size'),
+        keep_alive=not pytestconfig.getoption('--no-keep-alive'),
+    )
+    adapter = transport.adapter(request_metrics)
+    cassette_path = pytestconfig.getoption('--cassette')
+    if cassette_path:
+        adapter = CassetteAdapter(Cassette(cassette_path), pytestconfig.getoption('--cassette-mode'), adapter)
+
+    session = transport.configure(requests.Session(), adapter)
     session.hooks['response'].append(log_response)
 
-    return session
+    with session:
+        yield session
 
 
 @pytest.fixture
-def client(session: requests.Session) -> ApiClient:
-    return ApiClient(session)
+def client(
+    request: pytest.FixtureRequest,
+    pytestconfig: pytest.Config,
+    session: requests.Session,
+    response_cache: ResponseCache | SharedResponseCache | None,
+    host: str | None,
+    scheduler: Scheduler | None,
+) -> ApiClient:
+    if request.node.get_closest_marker('no_cache'):
+        response_cache = None
+
+    return ApiClient(
+        session,
+        cache=response_cache,
+        host=host,
+        scheduler=scheduler,
+        max_body_size=pytestconfig.getoption('--max-body-size'),
+    )
@@ -0,0 +1,110 @@
+import asyncio
+from contextlib import aclosing
+from http import HTTPStatus
+from typing import Callable
+
+import allure
+import httpx
+
+from api.async_client import AsyncApiClient
+from reporting import step
+from test_data.regions import RegionsTestData
+
+PAGE_SIZE = 5
+PAGES = -(-RegionsTestData.TOTAL_ITEMS // PAGE_SIZE)
+
+
+@allure.parent_suite('Regions')
+@allure.suite('Clients')
+@allure.sub_suite('Async client')
+class TestAsyncClient:
+    @allure.title('Gathered responses are in the order of params')
+    def test_gather_regions_order(self, stub_host: str):
+        # Earlier pages are answered later, so completion order is the reverse of the order of params
+        transport = _RecordingTransport(lambda request: (PAGES - int(request.url.params['page'])) * 0.05)
+
+        async def gather():
+            async with AsyncApiClient(httpx.AsyncClient(transport=transport), host=stub_host) as client:
+                params = [{'page': page, 'page_size': PAGE_SIZE} for page in range(1, PAGES + 1)]
+                return await client.gather_regions(params)
+
+        with step('Gather {pages} pages of regions', pages=PAGES):
+            responses = asyncio.run(gather())
+
+        with step('Check responses are in the order of params'):
+            assert [int(response.request.url.params['page']) for response in responses] == list(range(1, PAGES + 1))
+            assert transport.completed == list(range(PAGES, 0, -1))
+
+            ids = [item.id for response in responses for item in AsyncApiClient.parse_regions(response).items]
+            assert len(ids) == len(set(ids)) == RegionsTestData.TOTAL_ITEMS
+
+    @allure.title('Concurrent requests are limited by max_connections')
+    def test_max_connections_limit(self, stub_host: str):
+        transport = _RecordingTransport(lambda request: 0.05)
+
+        async def gather():
+            client = AsyncApiClient(httpx.AsyncClient(transport=transport), max_connections=2, host=stub_host)
+            async with client:
+                return await client.gather_regions([{'page': page} for page in range(1, 9)])
+
+        with step('Gather 8 pages with max_connections=2'):
+            responses = asyncio.run(gather())
+            assert all(response.status_code == HTTPStatus.OK for response in responses)
+
+        with step('Check at most 2 requests were in flight'):
+            assert transport.max_in_flight == 2
+
+    @allure.title('Leaving iter_pages early cancels the prefetched page')
+    def test_iter_pages_early_exit_cancels_prefetch(self, stub_host: str):
+        transport = _RecordingTransport(lambda request: 0.1)
+
+        async def first_page():
+            async with AsyncApiClient(httpx.AsyncClient(transport=transport), host=stub_host) as client:
+                async with aclosing(client.iter_pages(page_size=PAGE_SIZE)) as pages:
+                    async for regions in pages:
+                        # The next page is requested while the first one is processed
+                        await asyncio.sleep(0.05)
+                        break
+
+                await asyncio.sleep(0.3)
+                pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+                return regions, pending
+
+        with step('Take the first page and leave iter_pages'):
+            regions, pending = asyncio.run(first_page())
+            assert len(regions.items) == PAGE_SIZE
+
+        with step('Check the request of the next page was cancelled'):
+            assert transport.started == [1, 2]
+            assert transport.completed == [1]
+            assert not pending
+
+
+class _RecordingTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, delay: Callable[[httpx.Request], float]):
+        """
+        Transport holding every request for a delay and recording which pages were started and completed
+
+        :param delay: Seconds a request is held for before it is sent
+        """
+
+        super().__init__()
+        self.started: list[int] = []
+        self.completed: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._delay = delay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get('page', RegionsTestData.DEFAULT_PAGE_NUMBER))
+        self.started.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay(request))
+            response = await super().handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+        self.completed.append(page)
+        return response
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import allure
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.cassette import Cassette, CassetteAdapter, CassetteMiss
+from api.client import ApiClient
+from api.scheduler import RetryPolicy, Scheduler
+from reporting import step
+
+
+@allure.parent_suite('Regions')
+@allure.suite('Recorded responses')
+@allure.sub_suite('Record and replay')
+class TestCassette:
+    @allure.title('Missing recording fails at once with retries')
+    def test_missing_recording_is_not_retried(self, tmp_path):
+        scheduler = Scheduler(retry=RetryPolicy(attempts=4, backoff=10.0))
+        adapter = CassetteAdapter(Cassette(tmp_path / 'empty.cassette'), 'replay')
+
+        with requests.Session() as session:
+            session.mount('http://', adapter)
+            client = ApiClient(session, host='http://127.0.0.1:9', scheduler=scheduler)
+
+            with step('Get regions missing in the cassette'):
+                with pytest.raises(CassetteMiss):
+                    client.get_regions()
+
+        with step('Check the request was not retried'):
+            assert scheduler.retries == 0
+
+    @allure.title('Failed response is not recorded and retries reach the server')
+    def test_failed_response_is_not_recorded(self, tmp_path, stub_host: str):
+        cassette_path = tmp_path / 'regions.cassette'
+        network = _FailingOnceAdapter()
+        scheduler = Scheduler(retry=RetryPolicy(attempts=4, backoff=0.0))
+
+        with requests.Session() as session:
+            session.mount('http://', CassetteAdapter(Cassette(cassette_path), 'record', network))
+            client = ApiClient(session, host=stub_host, scheduler=scheduler)
+
+            with step('Get regions failing once with 503'):
+                regions_response = client.get_regions()
+                assert regions_response.status_code == HTTPStatus.OK
+
+        with step('Check the retry reached the server'):
+            assert network.sent == 2
+            assert scheduler.retries == 1
+
+        with step('Check the cassette replays the successful response'):
+            meta, _ = Cassette(cassette_path).get('GET /1.0/regions?')
+            assert meta['status'] == HTTPStatus.OK
+
+
+class _FailingOnceAdapter(HTTPAdapter):
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.sent += 1
+        if self.sent > 1:
+            return super().send(request, **kwargs)
+
+        response = requests.Response()
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+        response.request = request
+        response.url = request.url
+        response._content = b'{}'
+        return response
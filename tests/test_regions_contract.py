@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import allure
+import pytest
+
+from api.client import ApiClient
+from api.columns import RegionsColumns
+from reporting import step
+from test_data.contract import REGIONS_CONTRACT, Case
+from test_data.regions import RegionsTestData
+
+CASES = REGIONS_CONTRACT.cases()
+
+
+@allure.parent_suite('Regions')
+@allure.suite('Regions GET')
+@allure.sub_suite('Contract')
+class TestRegionsContract:
+    @pytest.mark.parametrize(
+        'case',
+        [case for case in CASES if case.error is None],
+        ids=str,
+    )
+    @allure.title('Get regions with valid params, {case}')
+    def test_get_regions_with_valid_params(self, client: ApiClient, case: Case):
+        with step('Get regions with {case}', case=case):
+            regions_response = client.get_regions(**case.params)
+            assert regions_response.status_code == HTTPStatus.OK
+
+        with step('Check items match params'):
+            regions_json = client.parse_regions(regions_response)
+            assert regions_json.total == RegionsTestData.TOTAL_ITEMS
+
+            params = REGIONS_CONTRACT.effective_params(case.params)
+            page = int(params.get('page', RegionsTestData.DEFAULT_PAGE_NUMBER))
+            page_size = int(params.get('page_size', RegionsTestData.DEFAULT_PAGE_SIZE))
+            assert len(regions_json.items) <= page_size
+
+            columns = RegionsColumns.from_pages([regions_json])
+            if 'q' in params:
+                violations = columns.names_not_containing(params['q'])
+                assert not violations, violations
+            elif 'country_code' in params:
+                violations = columns.country_codes_other_than(params['country_code'])
+                assert not violations, violations
+            else:
+                remaining = RegionsTestData.TOTAL_ITEMS - (page - 1) * page_size
+                assert len(regions_json.items) == max(0, min(page_size, remaining))
+
+        if params != case.params:
+            with step('Check response is the same as with {names} only', names=', '.join(params)):
+                effective_response = client.get_regions(**params)
+                assert effective_response.status_code == HTTPStatus.OK
+                assert client.parse_regions(effective_response) == regions_json
+
+    @pytest.mark.parametrize(
+        'case',
+        [case for case in CASES if case.error is not None],
+        ids=str,
+    )
+    @allure.title('Get regions with invalid params, {case}')
+    def test_get_regions_with_invalid_params(self, client: ApiClient, case: Case):
+        with step('Get regions with {case}', case=case):
+            regions_response = client.get_regions(**case.params)
+            assert regions_response.status_code == HTTPStatus.BAD_REQUEST
+
+        with step('Check error message'):
+            regions_error = client.parse_regions_error(regions_response)
+            assert regions_error.error.message == case.error
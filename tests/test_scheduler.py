@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+
+import allure
+import pytest
+import requests
+
+from api.scheduler import RetryPolicy, Scheduler
+from reporting import step
+
+URL = 'http://127.0.0.1:9/1.0/regions'
+
+
+@allure.parent_suite('Regions')
+@allure.suite('Clients')
+@allure.sub_suite('Retries and rate limit')
+class TestScheduler:
+    @allure.title('Retry-After in seconds is the delay')
+    def test_retry_after_seconds(self):
+        policy = RetryPolicy(max_backoff=10.0)
+
+        with step('Check delays of responses with Retry-After in seconds'):
+            assert policy.delay(1, _response(HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': '3'})) == 3.0
+            assert policy.delay(1, _response(HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '60'})) == 10.0
+
+    @allure.title('Retry-After as HTTP date is the delay')
+    def test_retry_after_date(self):
+        policy = RetryPolicy(max_backoff=10.0)
+        retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+
+        with step('Check delay of a response with Retry-After {retry_at}', retry_at=retry_at):
+            assert 3.5 < policy.delay(1, _response(HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': retry_at})) <= 5.0
+
+    @allure.title('Backoff without Retry-After is exponential with jitter')
+    def test_backoff_without_retry_after(self):
+        policy = RetryPolicy(backoff=0.2, max_backoff=1.0)
+
+        with step('Check delays of attempts stay within the exponential bound'):
+            for attempt, bound in ((1, 0.2), (2, 0.4), (3, 0.8), (4, 1.0), (10, 1.0)):
+                delays = [policy.delay(attempt, _response(HTTPStatus.BAD_GATEWAY)) for _ in range(100)]
+                assert all(0.0 <= delay <= bound for delay in delays)
+
+    @allure.title('Failing request is sent attempts times and the last response is returned')
+    def test_attempts(self):
+        scheduler = Scheduler(retry=RetryPolicy(attempts=3, backoff=0.0))
+        sent = []
+
+        with step('Send a request failing with 503'):
+            response = scheduler.call(URL, lambda: sent.append(1) or _response(HTTPStatus.SERVICE_UNAVAILABLE))
+
+        with step('Check it was sent 3 times'):
+            assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+            assert len(sent) == 3
+            assert scheduler.retries == 2
+
+    @allure.title('Transport error is raised after the last attempt')
+    def test_transport_error_raised_after_last_attempt(self):
+        scheduler = Scheduler(retry=RetryPolicy(attempts=3, backoff=0.0))
+        sent = []
+
+        def send():
+            sent.append(1)
+            raise requests.ConnectionError('Connection refused')
+
+        with step('Send a request failing with a connection error'):
+            with pytest.raises(requests.ConnectionError):
+                scheduler.call(URL, send)
+
+        with step('Check it was sent 3 times'):
+            assert len(sent) == 3
+
+    @allure.title('Rate is lowered on 429, kept on retried 5xx and grown back on success')
+    def test_rate_on_failures(self):
+        scheduler = Scheduler(rate=1000, retry=RetryPolicy(attempts=4, backoff=0.0))
+        responses = iter(
+            _response(status)
+            for status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.BAD_GATEWAY)
+        )
+
+        def send():
+            response = next(responses, _response(HTTPStatus.OK))
+            rates.append(scheduler.bucket.rate)
+            return response
+
+        rates = []
+        with step('Send a request failing with 429, 503 and 502'):
+            assert scheduler.call(URL, send).status_code == HTTPStatus.OK
+
+        with step('Check the rate was halved and grew back only after success'):
+            assert rates == [1000, 500, 500, 500]
+            assert scheduler.bucket.rate == 600
+
+
+def _response(status: int, headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b'{}'
+    response._content_consumed = True
+    return response
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import allure
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.async_client import AsyncApiClient
+from api.client import ApiClient
+from reporting import step
+
+CALLS = 5
+DELAY = 0.2
+
+
+@allure.parent_suite('Regions')
+@allure.suite('Clients')
+@allure.sub_suite('Coalesced requests')
+class TestSingleFlight:
+    @allure.title('Concurrent identical calls share one request')
+    def test_concurrent_calls_share_request(self, stub_host: str):
+        adapter = _SlowAdapter()
+        with _session(adapter) as session:
+            client = ApiClient(session, host=stub_host, coalesce=True)
+
+            with step('Get regions with the same params from {calls} threads', calls=CALLS):
+                responses = _in_threads(lambda: client.get_regions(q='нов'))
+
+        with step('Check one request was sent and its response was shared'):
+            assert adapter.sent == 1
+            assert all(response is responses[0] for response in responses)
+            assert responses[0].status_code == HTTPStatus.OK
+            assert client.coalesced == CALLS - 1
+
+    @allure.title('Error of a shared request reaches every caller')
+    def test_error_reaches_every_caller(self, stub_host: str):
+        adapter = _SlowAdapter(error=requests.ConnectionError('Connection refused'))
+        with _session(adapter) as session:
+            client = ApiClient(session, host=stub_host, coalesce=True)
+
+            with step('Get regions with the same params from {calls} threads', calls=CALLS):
+                results = _in_threads(lambda: _result_or_error(client.get_regions))
+
+            with step('Check every caller got the error of the one request'):
+                assert adapter.sent == 1
+                assert all(isinstance(result, requests.ConnectionError) for result in results)
+
+            with step('Check the next call sends a new request'):
+                adapter.error = None
+                assert client.get_regions().status_code == HTTPStatus.OK
+                assert adapter.sent == 2
+
+    @allure.title('Concurrent identical coroutines share one request')
+    def test_concurrent_coroutines_share_request(self, stub_host: str):
+        transport = _SlowTransport()
+
+        async def get_regions():
+            async with AsyncApiClient(httpx.AsyncClient(transport=transport), host=stub_host, coalesce=True) as client:
+                responses = await asyncio.gather(*(client.get_regions(q='нов') for _ in range(CALLS)))
+                return client, responses
+
+        with step('Get regions with the same params from {calls} coroutines', calls=CALLS):
+            client, responses = asyncio.run(get_regions())
+
+        with step('Check one request was sent and its response was shared'):
+            assert transport.sent == 1
+            assert all(response is responses[0] for response in responses)
+            assert responses[0].status_code == HTTPStatus.OK
+            assert client.coalesced == CALLS - 1
+
+    @allure.title('Error of a shared request reaches every coroutine')
+    def test_error_reaches_every_coroutine(self, stub_host: str):
+        transport = _SlowTransport(error=httpx.ConnectError('Connection refused'))
+
+        async def get_regions():
+            async with AsyncApiClient(httpx.AsyncClient(transport=transport), host=stub_host, coalesce=True) as client:
+                results = await asyncio.gather(*(client.get_regions() for _ in range(CALLS)), return_exceptions=True)
+                transport.error = None
+                return results, await client.get_regions()
+
+        with step('Get regions with the same params from {calls} coroutines, then once more', calls=CALLS):
+            results, response = asyncio.run(get_regions())
+
+        with step('Check every coroutine got the error and the next call sent a new request'):
+            assert all(isinstance(result, httpx.ConnectError) for result in results)
+            assert response.status_code == HTTPStatus.OK
+            assert transport.sent == 2
+
+
+class _SlowAdapter(HTTPAdapter):
+    def __init__(self, error: Exception | None = None):
+        """
+        Adapter counting sent requests and holding them for DELAY, so concurrent calls overlap
+
+        :param error: Raised instead of sending the request, if given
+        """
+
+        super().__init__()
+        self.sent = 0
+        self.error = error
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        with self._lock:
+            self.sent += 1
+        time.sleep(DELAY)
+        if self.error is not None:
+            raise self.error
+
+        return super().send(request, **kwargs)
+
+
+class _SlowTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, error: Exception | None = None):
+        """
+        Same as _SlowAdapter for the async client
+        """
+
+        super().__init__()
+        self.sent = 0
+        self.error = error
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.sent += 1
+        await asyncio.sleep(DELAY)
+        if self.error is not None:
+            raise self.error
+
+        return await super().handle_async_request(request)
+
+
+def _session(adapter: HTTPAdapter) -> requests.Session:
+    session = requests.Session()
+    session.mount('http://', adapter)
+    return session
+
+
+def _in_threads(call):
+    barrier = threading.Barrier(CALLS)
+
+    def wait_and_call():
+        barrier.wait()
+        return call()
+
+    with ThreadPoolExecutor(CALLS) as executor:
+        return list(executor.map(lambda _: wait_and_call(), range(CALLS)))
+
+
+def _result_or_error(call):
+    try:
+        return call()
+    except Exception as error:
+        return error
@@ -0,0 +1,60 @@
+import allure
+import requests
+
+from api.client import ApiClient
+from api.snapshot import Snapshot, SnapshotCrawler
+from reporting import step
+from stub.dataset import load_regions
+from stub.server import RegionsStubServer
+
+PAGE_SIZE = 5
+
+
+@allure.parent_suite('Regions')
+@allure.suite('Snapshots')
+@allure.sub_suite('Incremental crawl')
+class TestSnapshotCrawler:
+    @allure.title('Crawl of a changed catalogue reports added, removed and modified regions')
+    def test_crawl_changed_catalogue(self):
+        regions = load_regions()
+        with step('Crawl the catalogue of {count} regions', count=len(regions)):
+            previous, diff = _crawl(regions)
+            assert diff.added == [region['id'] for region in regions]
+            assert diff.pages_changed == len(previous.pages)
+
+        with step('Delete, rename and append a region on pages 5 and 2 and crawl again'):
+            changed = [region for region in regions if region['id'] != 21]
+            changed[7] = {**changed[7], 'name': 'Переименованный'}
+            changed.append({**regions[-1], 'id': 23, 'code': 'new'})
+            snapshot, diff = _crawl(changed, previous)
+
+        with step('Check the difference and that only the changed pages were decoded'):
+            assert diff.added == [23]
+            assert diff.removed == [21]
+            assert diff.modified == [8]
+            assert diff.pages_changed == 2
+            assert diff.pages_unchanged == 3
+            assert snapshot.total == len(changed)
+            assert snapshot.regions[8][0] == 'Переименованный'
+            assert sorted(snapshot.regions) == sorted(region['id'] for region in changed)
+
+    @allure.title('Pages differing only by total are not decoded')
+    def test_crawl_with_changed_total(self):
+        regions = load_regions()
+        previous, _ = _crawl(regions)
+
+        with step('Append a region to the last page and crawl again'):
+            changed = [*regions, {**regions[-1], 'id': 23, 'code': 'new'}]
+            snapshot, diff = _crawl(changed, previous)
+
+        with step('Check pages before the last one are unchanged by their content hash'):
+            assert diff.added == [23]
+            assert not diff.removed and not diff.modified
+            assert diff.pages_changed == 1
+            assert diff.pages_unchanged == len(previous.pages) - 1
+            assert snapshot.total == len(changed)
+
+
+def _crawl(regions: list[dict], previous: Snapshot | None = None):
+    with RegionsStubServer(regions) as server, requests.Session() as session:
+        return SnapshotCrawler(ApiClient(session, host=server.url), PAGE_SIZE).crawl(previous)
@@ -0,0 +1,38 @@
+import json
+import random
+
+import allure
+
+from api.streaming import ItemsParser
+from reporting import step
+from test_data.regions import RegionsTestData
+from test_data.synthetic import make_regions_payload
+
+
+@allure.parent_suite('Regions')
+@allure.suite('Clients')
+@allure.sub_suite('Streamed pages')
+class TestItemsParser:
+    @allure.title('Parse page body split in chunks')
+    def test_parse_page_split_in_chunks(self):
+        body = make_regions_payload(RegionsTestData.DEFAULT_PAGE_SIZE).decode()
+        page = json.loads(body)
+
+        # Numbers are cut in the middle only outside of items objects, so the page gets fractional and exponent ones
+        bodies = body, json.dumps({**page, 'total': 22.5, 'items': [*page['items'], 1.25e-07, -30]})
+        rnd = random.Random(0)
+        for body in bodies:
+            expected = json.loads(body)
+            splits = [[index] for index in range(1, len(body))]
+            splits += [sorted(rnd.sample(range(1, len(body)), rnd.randint(2, 50))) for _ in range(100)]
+
+            with step('Check items parsed from the body split in {count} ways', count=len(splits)):
+                for cuts in splits:
+                    parser = ItemsParser()
+                    items = []
+                    for start, end in zip([0, *cuts], [*cuts, len(body)]):
+                        items.extend(parser.feed(body[start:end]))
+                    parser.close()
+
+                    assert items == expected['items'], cuts
+                    assert parser.fields == {key: value for key, value in expected.items() if key != 'items'}, cuts
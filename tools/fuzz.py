@@ -0,0 +1,299 @@
+"""
+Property-based stress of GET /1.0/regions input validation
+
+Sends generated q, country_code, page and page_size inputs concurrently through the async client,
+checks every response against the contract of the endpoint and shrinks failed inputs to minimal reproducers.
+
+Usage: python -m tools.fuzz [--host URL | --stub] [--cases 20000] [--workers 1] [--concurrency 8] [--seed 0]
+                            [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, Iterator
+
+import httpx
+
+from api.async_client import AsyncApiClient
+from stub.dataset import load_regions
+from stub.server import RegionsStubServer
+from test_data.contract import REGIONS_CONTRACT
+from test_data.regions import RegionsTestData
+
+BATCH_SIZE = 1000
+
+ALPHABET = (
+    'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+    'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ' + string.ascii_letters + string.digits + ' -_.,+&%#/?=\'"'
+)
+INTEGER_EDGES = -1, 0, 1, 2, 5, 10, 15, 16, 100, 2**31, 2**63
+TEXT_EDGES = '', ' ', '+1', '1.0', '01', ' 1', '1e3', '0x10', 'null', '-0'
+
+
+@dataclass(frozen=True)
+class Failure:
+    kind: str
+    detail: str
+
+
+def generate_params(rnd: random.Random) -> dict[str, Any]:
+    """
+    Random query params, every param is omitted, valid or arbitrary with equal chances
+    """
+
+    params = {
+        'q': rnd.choice((None, _q(rnd, valid=True), _q(rnd, valid=False))),
+        'country_code': rnd.choice(
+            (
+                None,
+                rnd.choice(RegionsTestData.ACCEPTABLE_COUNTRY_CODES),
+                _text(rnd, rnd.randint(0, 3), string.ascii_letters),
+            )
+        ),
+        'page': rnd.choice((None, rnd.randint(1, 10), _number(rnd))),
+        'page_size': rnd.choice((None, rnd.choice(RegionsTestData.ACCEPTABLE_PAGES_SIZES), _number(rnd))),
+    }
+    return {name: value for name, value in params.items() if value is not None}
+
+
+def check(params: dict[str, Any], response: httpx.Response) -> Failure | None:
+    """
+    :return: How the response violates the contract for params, None if it doesn't
+    """
+
+    expected_error = REGIONS_CONTRACT.expected_error(params)
+    if expected_error is not None:
+        if response.status_code != HTTPStatus.BAD_REQUEST:
+            return Failure(f'status {response.status_code} instead of 400', expected_error)
+
+        try:
+            message = AsyncApiClient.parse_regions_error(response).error.message
+        except ValueError as error:
+            return Failure('invalid error body', str(error))
+        if message != expected_error:
+            return Failure('wrong error message', f'{message!r} instead of {expected_error!r}')
+        return None
+
+    if response.status_code != HTTPStatus.OK:
+        return Failure(f'status {response.status_code} instead of 200', response.text[:200])
+
+    try:
+        regions = AsyncApiClient.parse_regions(response)
+    except ValueError as error:
+        return Failure('invalid regions body', str(error))
+
+    return _check_items(REGIONS_CONTRACT.effective_params(params), regions)
+
+
+def shrink_candidates(params: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    Simpler variants of params: without one of the params or with one value simplified
+    """
+
+    for name in params:
+        yield {key: value for key, value in params.items() if key != name}
+
+    for name, value in params.items():
+        for simpler in _simplify(value):
+            yield {**params, name: simpler}
+
+
+class FuzzRun:
+    def __init__(self, host: str | None, cases: int, workers: int = 1, concurrency: int = 8, seed: int = 0):
+        """
+        Inputs are split between worker processes, each sending them through its own async client,
+        so neither the clients nor an in-process stand-in share an interpreter lock
+
+        :param host: Base URL of the API, settings.host if omitted
+        :param cases: Number of generated inputs
+        :param workers: Number of worker processes
+        :param concurrency: Number of concurrent requests of every worker
+        :param seed: Seed of generated inputs
+        """
+
+        self._host = host
+        self._cases = cases
+        self._workers = workers
+        self._concurrency = concurrency
+        self._seed = seed
+
+    def run(self) -> dict[str, Any]:
+        shares = [self._cases // self._workers + (i < self._cases % self._workers) for i in range(self._workers)]
+        seeds = [f'{self._seed}:{worker}' for worker in range(self._workers)]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(self._workers) as executor:
+            results = list(
+                executor.map(_fuzz, [self._host] * self._workers, shares, [self._concurrency] * self._workers, seeds)
+            )
+        elapsed = time.perf_counter() - start
+
+        failures: dict[str, dict[str, Any]] = {}
+        for result in results:
+            for failure in result['failures']:
+                known = failures.get(failure['kind'])
+                if known is None or _size(failure['params']) < _size(known['params']):
+                    failures[failure['kind']] = failure
+
+        return {
+            'config': {
+                'cases': self._cases,
+                'workers': self._workers,
+                'concurrency': self._concurrency,
+                'seed': self._seed,
+            },
+            'cases_per_minute': round(self._cases / elapsed * 60),
+            'coalesced': sum(result['coalesced'] for result in results),
+            'connections': {
+                name: sum(result['connections'][name] for result in results) for name in ('new', 'reused', 'wire_bytes')
+            },
+            'failures': list(failures.values()),
+        }
+
+
+def _fuzz(host: str | None, cases: int, concurrency: int, seed: str) -> dict[str, Any]:
+    return asyncio.run(_afuzz(host, cases, concurrency, seed))
+
+
+async def _afuzz(host: str | None, cases: int, concurrency: int, seed: str) -> dict[str, Any]:
+    """
+    :return: Shrunk first failure of every kind, number of coalesced requests and connection counters
+    """
+
+    rnd = random.Random(seed)
+    failures: dict[str, tuple[dict[str, Any], Failure]] = {}
+    async with AsyncApiClient(max_connections=concurrency, host=host, coalesce=True) as client:
+        for offset in range(0, cases, BATCH_SIZE):
+            batch = [generate_params(rnd) for _ in range(min(BATCH_SIZE, cases - offset))]
+            for params, response in zip(batch, await client.gather_regions(batch)):
+                failure = check(params, response)
+                if failure is not None and failure.kind not in failures:
+                    failures[failure.kind] = params, failure
+
+        reproducers = []
+        for kind, (params, failure) in failures.items():
+            params, failure = await _shrink(client, params, failure)
+            reproducers.append({'kind': kind, 'params': params, 'detail': failure.detail})
+
+    return {'failures': reproducers, 'coalesced': client.coalesced, 'connections': client.connections.summary()}
+
+
+async def _shrink(client: AsyncApiClient, params: dict[str, Any], failure: Failure) -> tuple[dict[str, Any], Failure]:
+    """
+    Greedily replace params with the first simpler variant failing the same way until none does
+    """
+
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for candidate in shrink_candidates(params):
+            if _size(candidate) >= _size(params):
+                continue
+
+            candidate_failure = check(candidate, await client.get_regions(**candidate))
+            if candidate_failure is not None and candidate_failure.kind == failure.kind:
+                params, failure, shrunk = candidate, candidate_failure, True
+                break
+
+    return params, failure
+
+
+def _check_items(params: dict[str, Any], regions: Any) -> Failure | None:
+    if regions.total != RegionsTestData.TOTAL_ITEMS:
+        return Failure('wrong total', f'{regions.total} instead of {RegionsTestData.TOTAL_ITEMS}')
+
+    page_size = int(params.get('page_size', RegionsTestData.DEFAULT_PAGE_SIZE))
+    if len(regions.items) > page_size:
+        return Failure('page too large', f'{len(regions.items)} items, page size {page_size}')
+
+    for item in regions.items:
+        if 'q' in params and params['q'].lower() not in item.name.lower():
+            return Failure('item not matching q', f'{item.name!r} doesn\'t contain {params["q"]!r}')
+        if 'country_code' in params and item.country.code != params['country_code']:
+            return Failure('item of other country', f'{item.name!r} of {item.country.code!r}')
+
+    return None
+
+
+def _q(rnd: random.Random, valid: bool) -> str:
+    if valid:
+        length = rnd.randint(RegionsTestData.Q_MIN_LENGTH, RegionsTestData.Q_MAX_LENGTH)
+    else:
+        length = rnd.choice((rnd.randint(0, RegionsTestData.Q_MIN_LENGTH - 1), rnd.randint(31, 60)))
+    return _text(rnd, length, ALPHABET)
+
+
+def _number(rnd: random.Random) -> int | float | str:
+    return rnd.choice(
+        (
+            rnd.choice(INTEGER_EDGES),
+            rnd.randint(-100, 100),
+            round(rnd.uniform(-10, 20), rnd.randint(1, 3)),
+            rnd.choice(TEXT_EDGES),
+            _text(rnd, rnd.randint(1, 5), ALPHABET),
+        )
+    )
+
+
+def _text(rnd: random.Random, length: int, alphabet: str) -> str:
+    return ''.join(rnd.choice(alphabet) for _ in range(length))
+
+
+def _simplify(value: Any) -> Iterator[Any]:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return
+    if isinstance(value, float):
+        yield int(value)
+        return
+    if isinstance(value, int):
+        yield from (0, 1, value // 2)
+        return
+
+    half = len(value) // 2
+    yield from (value[:half], value[half:], value[1:], value[:-1])
+    yield 'a' * len(value)
+
+
+def _size(params: dict[str, Any]) -> tuple[int, int, int]:
+    """
+    Order of shrinking: fewer params, then shorter values, then fewer characters other than 'a'
+    """
+
+    text = ''.join(str(value) for value in params.values())
+    return len(params), len(text), sum(char != 'a' for char in text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=None, help='Base URL of the API, HOST by default')
+    parser.add_argument('--stub', action='store_true', help='Run against the in-process stand-in')
+    parser.add_argument('--cases', type=int, default=20000, help='Number of generated inputs')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent requests of every worker')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of generated inputs')
+    parser.add_argument('--output', default=None, help='File to write JSON report to')
+    args = parser.parse_args()
+
+    server = RegionsStubServer(load_regions()) if args.stub else None
+    with server or nullcontext():
+        host = server.url if server else args.host
+        report = FuzzRun(host, args.cases, args.workers, args.concurrency, args.seed).run()
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+    if report['failures']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
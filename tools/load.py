@@ -0,0 +1,207 @@
+"""
+Load generation against GET /1.0/regions
+
+Sends query shapes of RegionsTestData at a target rate and reports latency percentiles,
+throughput and error rate per shape, and how many requests opened a new connection.
+
+Usage: python -m tools.load [--host URL | --stub] [--rps 50] [--concurrency 8] [--duration 30] [--no-keep-alive]
+                            [--output summary.json] [--baseline previous.json]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any
+
+import requests
+
+from api.client import ApiClient
+from api.instrumentation import RequestMetrics, percentiles
+from api.transport import TransportConfig
+from stub.dataset import load_regions
+from stub.server import RegionsStubServer
+from test_data.regions import RegionsTestData
+
+QUERY_SHAPES: dict[str, list[dict[str, Any]]] = {
+    'default': [{}],
+    'q': [{'q': q} for q in RegionsTestData.Q_STRINGS],
+    'country_code': [{'country_code': code} for code in RegionsTestData.ACCEPTABLE_COUNTRY_CODES],
+    'page': [
+        {'page': page}
+        for page in range(1, math.ceil(RegionsTestData.TOTAL_ITEMS / RegionsTestData.DEFAULT_PAGE_SIZE) + 1)
+    ],
+    'page_size': [{'page_size': page_size} for page_size in RegionsTestData.ACCEPTABLE_PAGES_SIZES],
+}
+
+
+@dataclass
+class ShapeStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, duration: float) -> dict[str, Any]:
+        requests_count = len(self.latencies)
+        return {
+            'requests': requests_count,
+            'errors': self.errors,
+            'error_rate': self.errors / requests_count if requests_count else 0.0,
+            'throughput': requests_count / duration,
+            'latency_ms': percentiles(self.latencies),
+        }
+
+
+class LoadRun:
+    def __init__(
+        self,
+        host: str | None,
+        rps: float,
+        concurrency: int,
+        duration: float,
+        seed: int = 0,
+        keep_alive: bool = True,
+    ):
+        """
+        Open-loop load: request i is due at i / rps seconds after start, latency is measured from the due time,
+        so a server that falls behind is not hidden by waiting workers
+
+        :param host: Base URL of the API, settings.host if omitted
+        :param rps: Target requests per second
+        :param concurrency: Number of workers, each with its own pooled session
+        :param duration: Seconds to send requests for
+        :param seed: Seed of the order of query shapes
+        :param keep_alive: Reuse connections of the sessions, every request opens a new one otherwise
+        """
+
+        self._host = host
+        self._rps = rps
+        self._concurrency = concurrency
+        self._duration = duration
+        self._schedule = self._make_schedule(random.Random(seed), int(rps * duration))
+        self._next = itertools.count()
+        self._stats: dict[str, ShapeStats] = defaultdict(ShapeStats)
+        self._lock = threading.Lock()
+        self._transport = TransportConfig(pool_connections=1, pool_size=1, keep_alive=keep_alive)
+        self._metrics = RequestMetrics(keep_timings=False)
+
+    def run(self) -> dict[str, Any]:
+        start = time.perf_counter() + 0.1
+        workers = [threading.Thread(target=self._work, args=(start,)) for _ in range(self._concurrency)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        elapsed = max(time.perf_counter() - start, self._duration)
+        total = ShapeStats()
+        for stats in self._stats.values():
+            total.latencies.extend(stats.latencies)
+            total.errors += stats.errors
+
+        return {
+            'config': {
+                'rps': self._rps,
+                'concurrency': self._concurrency,
+                'duration': self._duration,
+                'keep_alive': self._transport.keep_alive,
+            },
+            'shapes': {shape: stats.summary(elapsed) for shape, stats in sorted(self._stats.items())},
+            'total': total.summary(elapsed),
+            'connections': self._metrics.connections.summary(),
+        }
+
+    def _work(self, start: float) -> None:
+        with self._transport.session(self._metrics) as session:
+            client = ApiClient(session, host=self._host)
+            for index in self._next:
+                if index >= len(self._schedule):
+                    return
+
+                shape, params = self._schedule[index]
+                due = start + index / self._rps
+                time.sleep(max(0.0, due - time.perf_counter()))
+
+                try:
+                    failed = client.get_regions(**params).status_code != HTTPStatus.OK
+                except requests.RequestException:
+                    failed = True
+
+                latency = time.perf_counter() - due
+                with self._lock:
+                    stats = self._stats[shape]
+                    stats.latencies.append(latency)
+                    stats.errors += failed
+
+    @staticmethod
+    def _make_schedule(rnd: random.Random, count: int) -> list[tuple[str, dict[str, Any]]]:
+        shapes = sorted(QUERY_SHAPES)
+        schedule = []
+        for _ in range(count):
+            shape = rnd.choice(shapes)
+            schedule.append((shape, rnd.choice(QUERY_SHAPES[shape])))
+
+        return schedule
+
+
+def compare(summary: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """
+    :return: Lines with relative change of latency percentiles and error rate per shape against the baseline
+    """
+
+    lines = []
+    for shape, stats in summary['shapes'].items():
+        previous = baseline['shapes'].get(shape)
+        if previous is None:
+            lines.append(f'{shape}: not in baseline')
+            continue
+
+        changes = []
+        for name, value in stats['latency_ms'].items():
+            previous_value = previous['latency_ms'][name]
+            change = (value - previous_value) / previous_value * 100 if previous_value else 0.0
+            changes.append(f'{name} {previous_value:.1f} -> {value:.1f} ms ({change:+.0f}%)')
+        changes.append(f'error rate {previous["error_rate"]:.2%} -> {stats["error_rate"]:.2%}')
+        lines.append(f'{shape}: ' + ', '.join(changes))
+
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=None, help='Base URL of the API, HOST by default')
+    parser.add_argument('--stub', action='store_true', help='Run against the in-process stand-in')
+    parser.add_argument('--stub-regions', type=int, default=None, help='Number of synthetic regions of the stand-in')
+    parser.add_argument('--rps', type=float, default=50, help='Target requests per second')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent workers')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to send requests for')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the order of query shapes')
+    parser.add_argument('--no-keep-alive', action='store_true', help='Open a new connection for every request')
+    parser.add_argument('--output', default=None, help='File to write JSON summary to')
+    parser.add_argument('--baseline', default=None, help='JSON summary of a previous run to compare with')
+    args = parser.parse_args()
+
+    server = RegionsStubServer(load_regions(args.stub_regions)) if args.stub else None
+    with server or nullcontext():
+        host = server.url if server else args.host
+        summary = LoadRun(
+            host, args.rps, args.concurrency, args.duration, args.seed, keep_alive=not args.no_keep_alive
+        ).run()
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(summary, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            print('\n'.join(compare(summary, json.load(file))))
+
+
+if __name__ == '__main__':
+    main()
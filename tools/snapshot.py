@@ -0,0 +1,64 @@
+"""
+Snapshot of the whole regions catalogue and its difference from the previous snapshot
+
+Crawls all pages of GET /1.0/regions, reports added, removed and modified regions since the snapshot
+stored in the file and stores the new one there. Only pages whose content changed are decoded.
+
+Usage: python -m tools.snapshot [--host URL | --stub] --snapshot regions.json [--page-size 15] [--fail-on-change]
+"""
+
+import argparse
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+import requests
+
+from api.client import ApiClient
+from api.snapshot import Snapshot, SnapshotCrawler
+from stub.dataset import load_regions
+from stub.server import RegionsStubServer
+from test_data.regions import RegionsTestData
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=None, help='Base URL of the API, HOST by default')
+    parser.add_argument('--stub', action='store_true', help='Crawl the in-process stand-in')
+    parser.add_argument('--stub-regions', type=int, default=None, help='Number of synthetic regions of the stand-in')
+    parser.add_argument('--stub-seed', type=int, default=0, help='Seed of synthetic regions of the stand-in')
+    parser.add_argument('--snapshot', required=True, help='File of the previous snapshot, replaced with the new one')
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=RegionsTestData.DEFAULT_PAGE_SIZE,
+        choices=RegionsTestData.ACCEPTABLE_PAGES_SIZES,
+        help='Number of items per page',
+    )
+    parser.add_argument('--fail-on-change', action='store_true', help='Exit with 1 if the catalogue changed')
+    args = parser.parse_args()
+
+    path = Path(args.snapshot)
+    previous = Snapshot.load(path) if path.exists() else None
+
+    server = RegionsStubServer(load_regions(args.stub_regions, args.stub_seed)) if args.stub else None
+    with server or nullcontext(), requests.Session() as session:
+        client = ApiClient(session, host=server.url if server else args.host)
+        snapshot, diff = SnapshotCrawler(client, args.page_size).crawl(previous)
+
+    if previous is not None:
+        for line in diff.report(previous, snapshot):
+            print(line)
+    print(
+        f'{len(snapshot.regions)} regions, total {snapshot.total}: {len(diff.added)} added, '
+        f'{len(diff.removed)} removed, {len(diff.modified)} modified; '
+        f'{diff.pages_changed} of {len(snapshot.pages)} pages changed'
+    )
+    snapshot.save(path)
+
+    if args.fail_on_change and previous is not None and diff.changed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()